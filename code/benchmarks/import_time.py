@@ -0,0 +1,90 @@
+"""
+Benchmark del tiempo de importación y la memoria de arranque del análisis.
+
+Cada medición importa los modulos en un proceso nuevo de Python, para que no influyan los
+modulos ya cargados. Se compara la ruta que solo genera tablas (plotly no se carga) contra la
+ruta que genera gráficas (plotly se importa y se crea una gráfica).
+
+Uso (desde la carpeta code):
+    python -m benchmarks.import_time --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modulos que importa el script de análisis
+ANALYSIS_MODULES = ["services.synergy_reports", "services.synergy_runner", "services.synergy_services"]
+# Código que se ejecuta en el proceso nuevo: importa los modulos y, si se indica, crea una
+# gráfica (lo que carga plotly). Imprime duración, memoria pico y si plotly quedó cargado.
+IMPORT_SCRIPT = """
+import json, sys, time, tracemalloc
+trace, charts, modules = sys.argv[1] == "1", sys.argv[2] == "1", sys.argv[3:]
+if trace:
+    tracemalloc.start()
+start = time.perf_counter()
+for module in modules:
+    __import__(module)
+if charts:
+    from utils.graph_utils import Summary_Chart
+    Summary_Chart("unused").layout
+elapsed = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if trace else 0
+print(json.dumps({"seconds": elapsed, "peak": peak, "plotly": "plotly" in sys.modules,
+                  "modules": len(sys.modules)}))
+"""
+
+
+def import_run(modules: List[str], charts: bool, trace: bool) -> Dict[str, object]:
+    """Importa modulos en un proceso nuevo de Python (con la carpeta code como directorio).
+
+    Args:
+        modules (List[str]): Modulos a importar.
+        charts (bool): Si es True, se crea además el formato de una gráfica.
+        trace (bool): Si es True, se mide la memoria pico con tracemalloc.
+
+    Returns:
+        Dict[str, object]: Duración (s), memoria pico (bytes), si plotly se cargó y número de modulos.
+    """
+    code_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT, str(int(trace)), str(int(charts))] + modules,
+                            cwd=code_folder, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def measure_imports(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Mide el arranque de la ruta de solo tablas y de la ruta con gráficas, con el mismo formato
+    de resultados que run_benchmarks.measure (la memoria pico se mide en una ejecución aparte).
+
+    Args:
+        repeat (int, optional): Repeticiones cronometradas. Defaults to 5.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Resultados por benchmark ('import_data_only' e 'import_with_charts').
+    """
+    results = {}
+    for name, charts in [("import_data_only", False), ("import_with_charts", True)]:
+        times = [import_run(ANALYSIS_MODULES, charts, trace=False)["seconds"] for _ in range(repeat)]
+        traced_run = import_run(ANALYSIS_MODULES, charts, trace=True)
+        results[name] = {"repeat": repeat, "min_s": round(min(times), 6),
+                         "median_s": round(statistics.median(times), 6),
+                         "peak_mb": round(traced_run["peak"] / 2**20, 3),
+                         "plotly_loaded": traced_run["plotly"], "modules": traced_run["modules"]}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tiempo de importación y memoria de arranque del análisis.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada medición.")
+    args = parser.parse_args()
+    for name, result in measure_imports(args.repeat).items():
+        print(f"{name:<20}{result['median_s']:>10.4f} s{result['peak_mb']:>10.3f} MB"
+              f"{result['modules']:>8} modulos  plotly cargado: {result['plotly_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
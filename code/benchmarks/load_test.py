@@ -0,0 +1,167 @@
+"""
+Prueba de carga del servidor local de consultas (services.synergy_server).
+
+Abre varias conexiones persistentes contra el servidor y envía en cada una una mezcla de
+consultas (medidas, agregaciones y top-k) lo más rápido posible. Reporta peticiones por
+segundo, latencia p50/p95/p99 y errores.
+
+Uso (desde la carpeta code):
+    python -m benchmarks.load_test --spawn --workers 4 --concurrency 32 --requests 200
+    python -m benchmarks.load_test --port 8765 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+# Mezcla de consultas que envía cada cliente (en orden ciclico)
+REQUEST_MIX = [
+    "/measures?direction=Exports&year=2019",
+    "/measures?origin=Japan&destination=China",
+    "/measures?start_year=2016&end_year=2018&min_value=1000000",
+    "/aggregate?by=origin,destination&direction=Imports",
+    "/top?by=transport_mode&k=3&key=total_value&year=2018",
+    "/top?by=origin&k=10&key=frecuency&start_date=01/01/2017&end_date=30/06/2019",
+]
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, target: str) -> int:
+    """Envía un GET por una conexión persistente y lee la respuesta completa.
+
+    Returns:
+        int: Estado HTTP de la respuesta.
+    """
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("El servidor cerró la conexión.")
+    content_length = 0
+    while True:
+        header_line = await reader.readline()
+        if header_line in (b"\r\n", b""):
+            break
+        name, _, value = header_line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+    await reader.readexactly(content_length)
+    return int(status_line.split()[1])
+
+
+async def client(host: str, port: int, n_requests: int, offset: int, latencies: List[float],
+                 errors: List[str]) -> None:
+    """Cliente con una conexión: envía n_requests consultas de REQUEST_MIX, una tras otra."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as error:
+        errors.append(f"conexión: {error}")
+        return
+    try:
+        for i in range(n_requests):
+            target = REQUEST_MIX[(offset + i) % len(REQUEST_MIX)]
+            start = time.perf_counter()
+            try:
+                status = await request(reader, writer, host, target)
+            except (OSError, asyncio.IncompleteReadError) as error:
+                errors.append(f"{target}: {error}")
+                return
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f"{target}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, concurrency: int, requests_per_client: int) -> Dict[str, float]:
+    """Ejecuta la prueba de carga.
+
+    Args:
+        host (str): Dirección del servidor.
+        port (int): Puerto del servidor.
+        concurrency (int): Conexiones simultaneas.
+        requests_per_client (int): Peticiones por conexión.
+
+    Returns:
+        Dict[str, float]: Peticiones, errores, duración, peticiones por segundo y latencias (ms).
+            Si ninguna petición termina, las latencias quedan en None.
+    """
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests_per_client, offset, latencies, errors)
+                           for offset in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    results = {"requests": len(latencies), "errors": len(errors), "elapsed_s": round(elapsed, 3),
+               "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0}
+    if not latencies:
+        # Todas las peticiones fallaron (o no se envió ninguna): no hay latencias que resumir
+        for error in errors[:5]:
+            print(f"Error: {error}")
+        return {**results, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    latencies_ms = np.array(latencies) * 1000
+    return {**results,
+            "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+            "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+            "max_ms": round(float(latencies_ms.max()), 3)}
+
+
+async def wait_until_ready(host: str, port: int, timeout: float) -> None:
+    """Espera a que el servidor responda /health."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                if await request(reader, writer, host, "/health") == 200:
+                    return
+            finally:
+                writer.close()
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"El servidor no respondió en {timeout} s.")
+            await asyncio.sleep(0.2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor local de consultas.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del servidor.")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto del servidor.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Conexiones simultaneas.")
+    parser.add_argument("--requests", type=int, default=100, help="Peticiones por conexión.")
+    parser.add_argument("--spawn", action="store_true", help="Inicia el servidor para la prueba y lo termina al final.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Procesos del servidor (con --spawn).")
+    parser.add_argument("--data", default=None, help="CSV para el servidor (con --spawn).")
+    parser.add_argument("--output", default=None, help="Guarda los resultados en este archivo JSON.")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        command = [sys.executable, "-m", "services.synergy_server", "--host", args.host, "--port", str(args.port),
+                   "--workers", str(args.workers)]
+        if args.data is not None:
+            command += ["--data", args.data]
+        server = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        asyncio.run(wait_until_ready(args.host, args.port, timeout=120))
+        # Una ronda corta para que cada proceso del servidor cargue la tabla y el cubo
+        asyncio.run(run_load(args.host, args.port, args.concurrency, len(REQUEST_MIX)))
+        results = asyncio.run(run_load(args.host, args.port, args.concurrency, args.requests))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    for name, value in results.items():
+        print(f"{name:<16}{str(value):>12}")
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump({"config": vars(args), "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmarks de la capa de filtros y servicios de Synergy Logistics.
+
+Genera (o reutiliza) un CSV sintetico, mide tiempo y memoria pico de la importación de los
+modulos, de la carga, de consultas con uno y varios filtros, del top-k y de las opciones 1, 2
+y 3 completas, y guarda los resultados en JSON. Con --compare se comparan contra un archivo de
+resultados anterior.
+
+Uso (desde la carpeta code):
+    python -m benchmarks.run_benchmarks --rows 1000000 --routes 2000 --output bench.json
+    python -m benchmarks.run_benchmarks --rows 1000000 --routes 2000 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.import_time import measure_imports
+from benchmarks.synthetic_data import write_synthetic_csv
+from services.synergy_reports import option_1_partition, option_2_partition, option_3_partition
+from services.synergy_services import Service
+
+# Periodos que recorre el análisis completo
+DIRECTIONS = [None, "Imports", "Exports"]
+PERIODS = [None, 2015, 2016, 2017, 2018, 2019, 2020]
+
+
+class DiscardImages:
+    """Sustituye al pool de exportación de imagenes para medir el análisis sin kaleido."""
+    def submit(self, fig, file_name: str) -> None:
+        pass
+
+
+def measure(function: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Mide una función: tiempo de cada repetición y memoria pico de una ejecución adicional
+    con tracemalloc (se mide aparte para que el rastreo no afecte los tiempos).
+
+    Args:
+        function (Callable[[], object]): Función a medir.
+        repeat (int): Número de repeticiones cronometradas.
+
+    Returns:
+        Dict[str, float]: Tiempo minimo y mediana (segundos) y memoria pico (MB).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"repeat": repeat, "min_s": round(min(times), 6), "median_s": round(statistics.median(times), 6),
+            "peak_mb": round(peak / 2**20, 3)}
+
+
+def run_options(data_file_path: str, options: List[int]) -> None:
+    """
+    Ejecuta las particiones de las opciones indicadas como en el script de análisis. Las
+    tablas y gráficas (HTML) se escriben en una carpeta temporal, que también es el directorio
+    de trabajo mientras corren, de modo que el benchmark no deja archivos en el repositorio.
+
+    Args:
+        data_file_path (str): Ruta del CSV.
+        options (List[int]): Opciones a ejecutar (1, 2 y/o 3).
+    """
+    service = Service(compact=True, data_file_path=data_file_path)
+    # Se generan las gráficas, pero sin exportar imagenes (kaleido)
+    renderer = DiscardImages()
+    with tempfile.TemporaryDirectory() as output_path, open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        working_directory = os.getcwd()
+        os.chdir(output_path)
+        try:
+            if 1 in options:
+                routes = service.get_routes_list()
+                for direction in DIRECTIONS:
+                    for year in PERIODS:
+                        option_1_partition(service, direction, year, routes, output_path, renderer=renderer)
+            if 2 in options:
+                transport_modes = service.get_unique_values("transport_mode")
+                for direction in DIRECTIONS:
+                    for year in PERIODS:
+                        option_2_partition(service, direction, year, transport_modes, output_path, renderer=renderer)
+            if 3 in options:
+                origin_countries = service.get_unique_values("origin")
+                destination_countries = service.get_unique_values("destination")
+                for year in PERIODS:
+                    option_3_partition(service, year, origin_countries, destination_countries, output_path,
+                                       renderer=renderer)
+        finally:
+            sys.stdout = stdout
+            os.chdir(working_directory)
+
+
+def run_benchmarks(data_file_path: str, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Ejecuta todos los benchmarks sobre un CSV.
+
+    Args:
+        data_file_path (str): Ruta del CSV.
+        repeat (int, optional): Repeticiones de cada benchmark. Defaults to 5.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Resultados por benchmark.
+    """
+    results = {}
+    # Importación de los modulos (con y sin plotly)
+    results.update(measure_imports(repeat))
+    # Carga
+    results["load_csv"] = measure(lambda: Service(compact=True, use_cache=False, data_file_path=data_file_path), repeat)
+    results["build_cache"] = measure(lambda: Service(compact=True, rebuild_cache=True, data_file_path=data_file_path), repeat)
+    results["load_cached"] = measure(lambda: Service(compact=True, data_file_path=data_file_path), repeat)
+    # Consultas sin caché de resultados, para medir el filtrado en sí
+    service = Service(compact=True, data_file_path=data_file_path, cache_size=0)
+    origin, destination = service.get_routes_list(as_tuples=True)[0]
+    # Construir indice invertido y cubo antes de medir
+    service.inverted_index
+    service.cube
+    results["single_filter"] = measure(lambda: service.filter_routes_df(direction="Exports"), repeat)
+    results["multi_filter"] = measure(lambda: service.filter_routes_df(
+        direction="Exports", origin=origin, destination=destination, start_year=2019, end_year=2019), repeat)
+    results["range_filter"] = measure(lambda: service.filter_routes_df(
+        start_year=2016, end_year=2018, min_value=1_000_000), repeat)
+    routes = service.get_routes_list(as_tuples=True)
+    results["route_getters"] = measure(lambda: [(service.get_route_frecuency(route, "Exports", 2019),
+                                                 service.get_route_value(route, "Exports", 2019))
+                                                for route in routes], repeat)
+    results["aggregate_routes"] = measure(lambda: service.aggregate(["origin", "destination"], "Exports", 2019), repeat)
+    # Top-k
+    route_value = dict(zip(map(str, range(len(routes))), np.random.default_rng(0).integers(0, 10**9, len(routes))))
+    route_table = service.aggregate(["origin", "destination"])
+    results["top_k_dict"] = measure(lambda: service.top_k(route_value, 10), repeat)
+    results["top_k_table"] = measure(lambda: service.top_k(route_table, 10, key="total_value"), repeat)
+    # Análisis completo (sin exportar imagenes)
+    for option in [1, 2, 3]:
+        results[f"option_{option}"] = measure(lambda: run_options(data_file_path, [option]), repeat)
+    results["options_1_2_3"] = measure(lambda: run_options(data_file_path, [1, 2, 3]), repeat)
+    return results
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Compara la mediana de cada benchmark contra resultados anteriores.
+
+    Args:
+        current (Dict): Resultados actuales.
+        baseline (Dict): Resultados anteriores.
+        threshold (float): Razón actual/anterior a partir de la cual se reporta una regresión.
+
+    Returns:
+        List[str]: Benchmarks con regresión.
+    """
+    regressions = []
+    print(f"{'benchmark':<18}{'anterior (s)':>14}{'actual (s)':>14}{'razón':>8}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        previous = baseline["results"][name]["median_s"]
+        ratio = result["median_s"] / previous if previous else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESIÓN"
+        print(f"{name:<18}{previous:>14.6f}{result['median_s']:>14.6f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks de la capa de filtros y servicios de Synergy Logistics.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Registros del CSV sintetico (10k a 50M).")
+    parser.add_argument("--routes", type=int, default=172, help="Rutas distintas del CSV sintetico.")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador.")
+    parser.add_argument("--data", default=None,
+                        help="CSV a usar en lugar de generar uno (p. ej. la base real).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada benchmark.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Archivo JSON de resultados.")
+    parser.add_argument("--compare", default=None, help="JSON de resultados anterior para comparar.")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Razón de tiempo actual/anterior que se considera regresión.")
+    args = parser.parse_args()
+
+    # Leer los resultados anteriores antes de que --output pueda sobrescribirlos
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    config = {"repeat": args.repeat}
+    if args.data is not None:
+        data_file_path = args.data
+        config["data"] = os.path.basename(args.data)
+    else:
+        data_folder = os.path.join(tempfile.gettempdir(), "synergy_benchmarks")
+        data_file_path = os.path.join(data_folder, f"synthetic_{args.rows}_{args.routes}_{args.seed}.csv")
+        # El archivo sintetico se reutiliza entre ejecuciones con los mismos parametros
+        if not os.path.exists(data_file_path):
+            print(f"Generando {data_file_path}...")
+            write_synthetic_csv(data_file_path, args.rows, args.routes, args.seed)
+        config.update({"rows": args.rows, "routes": args.routes, "seed": args.seed})
+    results = {
+        "config": config,
+        "environment": {"python": platform.python_version(), "pandas": pd.__version__,
+                        "numpy": np.__version__, "machine": platform.machine(), "cpus": os.cpu_count()},
+        "results": run_benchmarks(data_file_path, args.repeat),
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Resultados guardados en {args.output}")
+    if baseline is not None:
+        if compare_results(results, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        for name, result in results["results"].items():
+            print(f"{name:<18}{result['median_s']:>12.6f} s{result['peak_mb']:>12.3f} MB")
+
+
+if __name__ == "__main__":
+    main()
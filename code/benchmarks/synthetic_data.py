@@ -0,0 +1,148 @@
+"""
+Generador de datos sinteticos con el mismo esquema que el CSV de Synergy Logistics.
+
+Las cardinalidades por defecto son las de la base real (35 paises, 28 productos, 77 compañias,
+4 medios de transporte, 6 años) y la proporción de importaciones/exportaciones y de medios de
+transporte es similar. El número de filas y de rutas es configurable; para tablas grandes el
+archivo se escribe por bloques, sin generar toda la tabla en memoria.
+"""
+import argparse
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from processing.sl_filters import CSV_DATE_FORMAT
+
+# Paises de la base real; si se piden más rutas de las que permiten, se agregan paises sinteticos
+BASE_COUNTRIES = ["Argentina", "Australia", "Austria", "Belgium", "Belorussia", "Brazil", "Canada",
+                  "China", "Croatia", "France", "Germany", "India", "Ireland", "Italy", "Japan",
+                  "Malaysia", "Mexico", "Netherlands", "New Zealand", "Peru", "Philippines", "Poland",
+                  "Russia", "Singapore", "Slovakia", "South Korea", "Spain", "Switzerland", "Thailand",
+                  "Turkey", "USA", "United Arab Emirates", "United Kingdom", "Vietnam", "Chile"]
+DIRECTIONS = ["Exports", "Imports"]
+DIRECTION_WEIGHTS = [0.81, 0.19]
+TRANSPORT_MODES = ["Sea", "Rail", "Road", "Air"]
+TRANSPORT_WEIGHTS = [0.56, 0.18, 0.14, 0.12]
+YEARS = [2015, 2016, 2017, 2018, 2019, 2020]
+N_PRODUCTS = 28
+N_COMPANIES = 77
+# Registros generados por bloque
+GENERATION_CHUNK = 1_000_000
+# Columnas del CSV en el orden original
+CSV_COLUMNS = ["register_id", "direction", "origin", "destination", "year", "date", "product",
+               "transport_mode", "company_name", "total_value"]
+
+
+def country_names(n_countries: int) -> List[str]:
+    """Nombres de paises: los de la base real y, si faltan, paises sinteticos.
+
+    Args:
+        n_countries (int): Número de paises.
+
+    Returns:
+        List[str]: Nombres de paises (sin guiones, para que las rutas origen-destino sean validas).
+    """
+    names = BASE_COUNTRIES[:n_countries]
+    names += [f"Country {i:04d}" for i in range(len(names), n_countries)]
+    return names
+
+
+def route_pairs(n_routes: int, rng: np.random.Generator) -> np.ndarray:
+    """Elige rutas (origen, destino) distintas, con origen diferente al destino.
+
+    Args:
+        n_routes (int): Número de rutas.
+        rng (np.random.Generator): Generador de números aleatorios.
+
+    Returns:
+        np.ndarray: Arreglo (n_routes, 2) con indices de pais de origen y de destino.
+    """
+    # Paises suficientes para tener al menos el doble de pares posibles que rutas pedidas
+    n_countries = len(BASE_COUNTRIES)
+    while n_countries * (n_countries - 1) < 2 * n_routes:
+        n_countries *= 2
+    pair_ids = rng.choice(n_countries * (n_countries - 1), size=n_routes, replace=False)
+    origins = pair_ids // (n_countries - 1)
+    destinations = pair_ids % (n_countries - 1)
+    # Saltar el propio pais de origen
+    destinations = destinations + (destinations >= origins)
+    return np.column_stack([origins, destinations])
+
+
+def synthetic_chunk(n_rows: int, first_id: int, routes: np.ndarray, countries: np.ndarray,
+                    rng: np.random.Generator) -> pd.DataFrame:
+    """Genera un bloque de registros sinteticos.
+
+    Args:
+        n_rows (int): Número de registros del bloque.
+        first_id (int): register_id del primer registro.
+        routes (np.ndarray): Rutas (indices de origen y destino).
+        countries (np.ndarray): Nombres de paises.
+        rng (np.random.Generator): Generador de números aleatorios.
+
+    Returns:
+        pd.DataFrame: Bloque con las columnas del CSV de Synergy Logistics.
+    """
+    # Pocas rutas concentran la mayor parte de los registros, como en la base real
+    route_weights = 1 / np.arange(1, len(routes) + 1)
+    route_ids = rng.choice(len(routes), size=n_rows, p=route_weights / route_weights.sum())
+    year_ids = rng.integers(0, len(YEARS), size=n_rows)
+    days = rng.integers(0, 365, size=n_rows)
+    # Texto de cada fecha posible (año, dia), calculado una sola vez
+    date_strings = np.array([(pd.Timestamp(year, 1, 1) + pd.to_timedelta(np.arange(365), unit="D"))
+                             .strftime(CSV_DATE_FORMAT) for year in YEARS], dtype=object)
+    # Valores en millones con algunos valores pequeños y ceros
+    values = np.round(rng.lognormal(mean=15.6, sigma=1.2, size=n_rows), -6).astype(np.int64)
+    small = rng.random(n_rows) < 0.15
+    values[small] = rng.choice([0, 1000, 2000, 64000], size=small.sum())
+    return pd.DataFrame({
+        "register_id": np.arange(first_id, first_id + n_rows),
+        "direction": rng.choice(DIRECTIONS, size=n_rows, p=DIRECTION_WEIGHTS),
+        "origin": countries[routes[route_ids, 0]],
+        "destination": countries[routes[route_ids, 1]],
+        "year": np.array(YEARS)[year_ids],
+        "date": date_strings[year_ids, days],
+        "product": rng.choice([f"Product {i:02d}" for i in range(N_PRODUCTS)], size=n_rows),
+        "transport_mode": rng.choice(TRANSPORT_MODES, size=n_rows, p=TRANSPORT_WEIGHTS),
+        "company_name": rng.choice([f"Company {i:02d}" for i in range(N_COMPANIES)], size=n_rows),
+        "total_value": values,
+    }, columns=CSV_COLUMNS)
+
+
+def write_synthetic_csv(file_path: str, n_rows: int, n_routes: int = 172, seed: int = 0) -> str:
+    """
+    Escribe un CSV sintetico con el esquema de Synergy Logistics. Con la misma semilla se
+    obtiene exactamente el mismo archivo.
+
+    Args:
+        file_path (str): Ruta del CSV a generar.
+        n_rows (int): Número de registros.
+        n_routes (int, optional): Número de rutas distintas. Defaults to 172 (como la base real).
+        seed (int, optional): Semilla del generador. Defaults to 0.
+
+    Returns:
+        str: Ruta del CSV generado.
+    """
+    rng = np.random.default_rng(seed)
+    routes = route_pairs(n_routes, rng)
+    countries = np.array(country_names(int(routes.max()) + 1), dtype=object)
+    folder = os.path.dirname(file_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(file_path, "w", newline="") as csv_file:
+        for first_row in range(0, n_rows, GENERATION_CHUNK):
+            chunk = synthetic_chunk(min(GENERATION_CHUNK, n_rows - first_row), first_row + 1, routes, countries, rng)
+            chunk.to_csv(csv_file, index=False, header=first_row == 0)
+    return file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un CSV sintetico con el esquema de Synergy Logistics.")
+    parser.add_argument("file_path", help="Ruta del CSV a generar.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Número de registros.")
+    parser.add_argument("--routes", type=int, default=172, help="Número de rutas distintas.")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador.")
+    args = parser.parse_args()
+    write_synthetic_csv(args.file_path, args.rows, args.routes, args.seed)
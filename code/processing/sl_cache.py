@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+# Versión del formato de la caché. Cambiarla invalida las cachés existentes.
+CACHE_VERSION = 3
+# Nombre del archivo con la descripción de la caché
+META_FILE = "meta.json"
+
+
+def cache_dir_for(data_file_path: str) -> str:
+    """Ruta de la carpeta de caché asociada a un archivo CSV (junto al archivo).
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+
+    Returns:
+        str: Ruta de la carpeta de caché.
+    """
+    folder, file_name = os.path.split(os.path.abspath(data_file_path))
+    return os.path.join(folder, f".{file_name}.cache")
+
+
+def file_hash(data_file_path: str) -> str:
+    """Hash SHA-256 del contenido de un archivo.
+
+    Args:
+        data_file_path (str): Ruta del archivo.
+
+    Returns:
+        str: Hash en hexadecimal.
+    """
+    digest = hashlib.sha256()
+    with open(data_file_path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(data_file_path: str) -> Dict:
+    """Tamaño y fecha de modificación del CSV, usados para validar la caché.
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+
+    Returns:
+        Dict: Llave con 'size' y 'mtime_ns'.
+    """
+    stat = os.stat(data_file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def codes_dtype(n_categories: int) -> np.dtype:
+    """Tipo entero más pequeño para los codigos de n categorias (el mismo que usa pandas)."""
+    for dtype in [np.int8, np.int16, np.int32]:
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def save_cached_table(routes_table: DataFrame, data_file_path: str,
+                      compact_dtypes: Dict[str, str] or None = None) -> None:
+    """
+    Guarda la tabla como un arreglo .npy por columna. Las columnas de texto se guardan como
+    codigos enteros más su diccionario de valores, y las fechas como enteros. Los codigos y
+    las columnas numericas se guardan con el tipo de la tabla compacta, para que al cargarla
+    los arreglos se usen tal cual, sin convertirlos.
+
+    Args:
+        routes_table (DataFrame): Tabla leida del CSV.
+        data_file_path (str): Ruta del archivo CSV del que proviene la tabla.
+        compact_dtypes (Dict[str, str] or None, optional): Tipo compacto de columnas numericas
+            (p. ej. {'year': 'int16'}). Defaults to None (se guardan con su tipo).
+    """
+    compact_dtypes = compact_dtypes or {}
+    cache_dir = cache_dir_for(data_file_path)
+    tmp_dir = f"{cache_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    columns = []
+    for position, column in enumerate(routes_table.columns):
+        column_values = routes_table[column]
+        file_name = f"{position}.npy"
+        if column_values.dtype == object or isinstance(column_values.dtype, pd.CategoricalDtype) \
+                or pd.api.types.is_string_dtype(column_values.dtype):
+            codes, categories = pd.factorize(column_values)
+            np.save(os.path.join(tmp_dir, file_name), codes.astype(codes_dtype(len(categories))))
+            columns.append({"name": column, "kind": "category", "file": file_name,
+                            "categories": [str(category) for category in categories]})
+        elif pd.api.types.is_datetime64_dtype(column_values.dtype):
+            np.save(os.path.join(tmp_dir, file_name), column_values.to_numpy().view(np.int64))
+            columns.append({"name": column, "kind": "datetime", "file": file_name,
+                            "dtype": str(column_values.dtype)})
+        else:
+            np.save(os.path.join(tmp_dir, file_name),
+                    column_values.to_numpy().astype(compact_dtypes.get(column, column_values.dtype)))
+            columns.append({"name": column, "kind": "numeric", "file": file_name, "dtype": str(column_values.dtype)})
+    np.save(os.path.join(tmp_dir, "index.npy"), routes_table.index.to_numpy())
+    source = source_key(data_file_path)
+    source["sha256"] = file_hash(data_file_path)
+    meta = {"version": CACHE_VERSION, "source": source, "index": routes_table.index.name,
+            "columns": columns}
+    with open(os.path.join(tmp_dir, META_FILE), "w") as meta_file:
+        json.dump(meta, meta_file)
+    # Reemplazar la caché anterior solo cuando la nueva está completa
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+
+def load_cached_table(data_file_path: str, compact: bool = False) -> DataFrame or None:
+    """
+    Carga la tabla desde la caché si existe y corresponde al CSV actual. Si el tamaño o la
+    fecha de modificación no coinciden, se compara el hash del contenido antes de descartarla.
+    En la tabla compacta las columnas usan directamente los arreglos de la caché abiertos como
+    memoria mapeada (copia en escritura): los procesos que cargan la misma caché comparten sus
+    paginas hasta que alguno las modifica.
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+        compact (bool, optional): Si es True, las columnas de texto se cargan como categoricas.
+            Defaults to False.
+
+    Returns:
+        DataFrame or None: Tabla cargada, o None si la caché no existe o no es valida.
+    """
+    cache_dir = cache_dir_for(data_file_path)
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as meta_file:
+        meta = json.load(meta_file)
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    current_source = source_key(data_file_path)
+    cached_source = meta["source"]
+    if (cached_source["size"], cached_source["mtime_ns"]) != (current_source["size"], current_source["mtime_ns"]):
+        # El archivo pudo haberse tocado sin cambiar su contenido
+        if cached_source["size"] != current_source["size"] or file_hash(data_file_path) != cached_source["sha256"]:
+            return None
+        meta["source"].update(current_source)
+        with open(meta_path, "w") as meta_file:
+            json.dump(meta, meta_file)
+    data = {}
+    for column in meta["columns"]:
+        values = np.load(os.path.join(cache_dir, column["file"]), mmap_mode="c")
+        if column["kind"] == "category":
+            # from_codes usa los codigos sin copiarlos y convierte el codigo -1 en valor faltante
+            values = pd.Categorical.from_codes(values, pd.Index(column["categories"], dtype=object))
+            data[column["name"]] = values if compact else np.asarray(values, dtype=object)
+        elif column["kind"] == "datetime":
+            data[column["name"]] = values.view(column["dtype"])
+        elif not compact and values.dtype != column["dtype"]:
+            # Fuera de la tabla compacta las columnas conservan el tipo con el que se leyeron
+            data[column["name"]] = values.astype(column["dtype"])
+        else:
+            data[column["name"]] = values
+    index = pd.Index(np.load(os.path.join(cache_dir, "index.npy"), mmap_mode="c"), name=meta["index"])
+    # copy=False: el DataFrame guarda los arreglos de la caché en lugar de copiarlos
+    return pd.DataFrame(data, index=index, copy=False)
@@ -0,0 +1,137 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+# Dimensiones del cubo (columnas de agrupación)
+CUBE_DIMENSIONS = ["direction", "year", "origin", "destination", "transport_mode", "product"]
+
+
+def add_shares(table: DataFrame) -> DataFrame:
+    """
+    Agrega a una tabla de medidas las columnas 'frecuency_pct' y 'total_value_pct': cada
+    medida como porcentaje (redondeado a 2 decimales) del total de la tabla, en una sola
+    operación vectorizada por columna.
+
+    Args:
+        table (DataFrame): Tabla con columnas 'frecuency' y/o 'total_value'.
+
+    Returns:
+        DataFrame: La misma tabla con las columnas de porcentaje.
+    """
+    for measure in ["frecuency", "total_value"]:
+        if measure not in table.columns:
+            continue
+        values = table[measure].to_numpy()
+        total = values.sum()
+        table[f"{measure}_pct"] = np.round(values / total * 100, 2) if total else 0.0
+    return table
+
+
+class SynergyLogisticsCube():
+    """
+    Cubo OLAP con el número de transacciones ('frecuency') y la suma de 'total_value' para
+    cada combinación de dimensiones que aparece en la tabla. Cualquier corte o agregación
+    sobre estas dimensiones se responde desde las celdas del cubo, sin recorrer las filas.
+    """
+    def __init__(self, routes_table: DataFrame, dimensions: List[str] = CUBE_DIMENSIONS) -> None:
+        """Calcula las celdas del cubo en una sola agrupación.
+
+        Args:
+            routes_table (DataFrame): Tabla de Synergy Logistics.
+            dimensions (List[str], optional): Dimensiones del cubo. Defaults to CUBE_DIMENSIONS.
+        """
+        self.dimensions = list(dimensions)
+        # Las celdas quedan en el orden en que aparecen en la tabla
+        self.cells = (routes_table.groupby(self.dimensions, sort=False, observed=True)["total_value"]
+                      .agg(frecuency="size", total_value="sum")
+                      .reset_index())
+
+    @classmethod
+    def from_cells(cls, cells: DataFrame, dimensions: List[str] = CUBE_DIMENSIONS) -> "SynergyLogisticsCube":
+        """Crea el cubo a partir de celdas ya agregadas (por ejemplo, con GROUP BY en una base).
+
+        Args:
+            cells (DataFrame): Celdas con las dimensiones del cubo, 'frecuency' y 'total_value',
+                en el orden en que aparecen en la tabla.
+            dimensions (List[str], optional): Dimensiones del cubo. Defaults to CUBE_DIMENSIONS.
+
+        Returns:
+            SynergyLogisticsCube: Cubo con esas celdas.
+        """
+        cube = cls.__new__(cls)
+        cube.dimensions = list(dimensions)
+        cube.cells = cells[cube.dimensions + ["frecuency", "total_value"]].reset_index(drop=True)
+        return cube
+
+    def add_cells(self, cells: DataFrame) -> None:
+        """
+        Suma al cubo celdas calculadas sobre otras filas (por ejemplo, otro bloque del CSV).
+        Las celdas nuevas se agregan después de las existentes.
+
+        Args:
+            cells (DataFrame): Celdas con las dimensiones del cubo, 'frecuency' y 'total_value'.
+        """
+        combined = pd.concat([self.cells, cells], ignore_index=True)
+        self.cells = (combined.groupby(self.dimensions, sort=False, observed=True)[["frecuency", "total_value"]]
+                      .sum()
+                      .reset_index())
+
+    def slice(self, filters: Dict[str, object] or None = None) -> DataFrame:
+        """Celdas del cubo que cumplen con los filtros de igualdad indicados.
+
+        Args:
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Celdas del corte.
+        """
+        cells = self.cells
+        if not filters:
+            return cells
+        mask = np.ones(len(cells), dtype=bool)
+        for dimension, value in filters.items():
+            mask &= (cells[dimension] == value).to_numpy()
+        return cells[mask]
+
+    def total(self, filters: Dict[str, object] or None = None) -> Tuple[int, int]:
+        """Número de transacciones y valor total de un corte del cubo.
+
+        Args:
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            Tuple[int, int]: Frecuencia y suma de valor del corte.
+        """
+        cells = self.slice(filters)
+        return int(cells["frecuency"].sum()), int(cells["total_value"].sum())
+
+    def rollup(self, by: List[str], filters: Dict[str, object] or None = None) -> DataFrame:
+        """Agrega las celdas de un corte por las dimensiones indicadas.
+
+        Args:
+            by (List[str]): Dimensiones de agrupación.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Dimensiones de agrupación, 'frecuency' y 'total_value', en el orden
+                en que cada grupo aparece en la tabla.
+        """
+        cells = self.slice(filters)
+        return (cells.groupby(by, sort=False, observed=True)[["frecuency", "total_value"]]
+                .sum()
+                .reset_index())
+
+    def percent_of_total(self, by: List[str], filters: Dict[str, object] or None = None) -> DataFrame:
+        """
+        Agrega un corte por las dimensiones indicadas y expresa frecuencia y valor como
+        porcentaje de los margenes (totales) del mismo corte.
+
+        Args:
+            by (List[str]): Dimensiones de agrupación.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Resultado de rollup con columnas 'frecuency_pct' y 'total_value_pct'.
+        """
+        return add_shares(self.rollup(by, filters))
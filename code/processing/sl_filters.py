@@ -1,19 +1,448 @@
-from typing import List
+from typing import Dict, Iterator, List, Set, Tuple
+import operator
+import numpy as np
 import pandas as pd
 from pandas.core.frame import DataFrame
+from pandas.core.series import Series
 from datetime import datetime
 
+from processing.sl_cache import load_cached_table, save_cached_table
+from processing.sl_cube import CUBE_DIMENSIONS, SynergyLogisticsCube
+from processing.sl_index import SynergyLogisticsIndex
+from processing.sl_matrix import MATRIX_DIMENSIONS, SynergyLogisticsRouteMatrix
+from processing.sl_query import SynergyLogisticsQuery
+from processing.sl_sqlite import SynergyLogisticsSQLite
+from processing.sl_timeseries import SynergyLogisticsTimeSeries
+from utils.instrumentation import instrumented
+
 # Definir ubicación de archivo CSV
 DATA_FILE_PATH = "data\synergy_logistics_database.csv"
+# Formato de las fechas dentro del CSV (dia/mes/año de dos digitos)
+CSV_DATE_FORMAT = "%d/%m/%y"
+# Columnas de texto que se filtran por igualdad
+CATEGORY_COLUMNS = ["direction", "origin", "destination", "product", "transport_mode", "company_name"]
+# Tipos de las columnas numericas en la tabla compacta
+COMPACT_NUMERIC_DTYPES = {"year": "int16", "total_value": "int64"}
+# Columnas con indice invertido
+INDEX_COLUMNS = CATEGORY_COLUMNS + ["year"]
+# Columnas con filtros de rango (se guarda su minimo y maximo para estimar selectividad)
+RANGE_COLUMNS = ["year", "date", "total_value"]
+# Almacenamientos de la tabla: DataFrame en memoria o base SQLite local
+BACKENDS = ["pandas", "sqlite"]
+
+def read_synergy_csv(data_file_path: str) -> DataFrame:
+    """Lee el CSV de Synergy Logistics y convierte la columna de fechas.
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+
+    Returns:
+        DataFrame: Tabla indexada por register_id.
+    """
+    synergy_db = pd.read_csv(data_file_path, index_col="register_id")
+    # Convert date column to datetime objects
+    synergy_db["date"] = parse_dates(synergy_db["date"])
+    return synergy_db
+
+
+def read_synergy_chunks(data_file_path: str, chunksize: int, compact: bool = False) -> Iterator[DataFrame]:
+    """Lee el CSV de Synergy Logistics por bloques de filas.
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+        chunksize (int): Número de filas por bloque.
+        compact (bool, optional): Si es True, cada bloque se convierte a su representación
+            compacta. Defaults to False.
+
+    Yields:
+        Iterator[DataFrame]: Bloques de la tabla indexados por register_id.
+    """
+    for chunk in pd.read_csv(data_file_path, index_col="register_id", chunksize=chunksize):
+        chunk["date"] = parse_dates(chunk["date"])
+        yield compact_table(chunk) if compact else chunk
+
+
+def parse_dates(date_strings: Series) -> Series:
+    """
+    Convierte fechas con formato DD/MM/YY a datetime. Cada fecha distinta se convierte una
+    sola vez (hay muchas menos fechas distintas que filas) y el resultado se reparte a las filas.
+
+    Args:
+        date_strings (Series): Columna de fechas como texto.
+
+    Returns:
+        Series: Columna de fechas como datetime (NaT si la fecha no existe).
+    """
+    codes, unique_dates = pd.factorize(date_strings)
+    parsed_dates = pd.DatetimeIndex(pd.to_datetime(unique_dates, format=CSV_DATE_FORMAT))
+    parsed_dates = parsed_dates.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(parsed_dates, index=date_strings.index, name=date_strings.name)
+
+
+def compact_table(routes_table: DataFrame) -> DataFrame:
+    """
+    Convierte la tabla a su representación compacta: columnas de texto como categoricas,
+    year como int16 y total_value como int64.
+
+    Args:
+        routes_table (DataFrame): Tabla de Synergy Logistics.
+
+    Returns:
+        DataFrame: Tabla con tipos de datos compactos.
+    """
+    compact_dtypes = {column: "category" for column in CATEGORY_COLUMNS}
+    compact_dtypes.update(COMPACT_NUMERIC_DTYPES)
+    # Las columnas que ya tienen su tipo compacto (p. ej. las cargadas de la caché) no se copian
+    compact_dtypes = {column: dtype for column, dtype in compact_dtypes.items() if routes_table[column].dtype != dtype}
+    return routes_table.astype(compact_dtypes) if compact_dtypes else routes_table
+
+
+def align_categories(routes_table: DataFrame, new_rows: DataFrame) -> Tuple[DataFrame, DataFrame]:
+    """
+    Da a las columnas categoricas de dos tablas compactas las mismas categorias, para que al
+    concatenarlas sigan siendo categoricas. Las categorias existentes conservan su codigo.
+
+    Args:
+        routes_table (DataFrame): Tabla compacta existente.
+        new_rows (DataFrame): Filas compactas nuevas.
+
+    Returns:
+        Tuple[DataFrame, DataFrame]: Ambas tablas con categorias comunes.
+    """
+    aligned_columns, aligned_new_columns = {}, {}
+    for column in CATEGORY_COLUMNS:
+        categories = routes_table[column].cat.categories
+        new_categories = [value for value in new_rows[column].unique() if value not in categories]
+        if new_categories:
+            categories = categories.append(pd.Index(new_categories, dtype=categories.dtype))
+            aligned_columns[column] = routes_table[column].cat.set_categories(categories)
+        aligned_new_columns[column] = new_rows[column].cat.set_categories(categories)
+    return routes_table.assign(**aligned_columns), new_rows.assign(**aligned_new_columns)
+
 
 class SynergyLogisticsFilters():
-    def __init__(self) -> None:
+    @instrumented("SynergyLogisticsFilters.load",
+                  rows=lambda result, self, *args, **kwargs: 0 if self.SYNERGY_DB is None else len(self.SYNERGY_DB))
+    def __init__(self, compact: bool = False, use_cache: bool = True, rebuild_cache: bool = False,
+                 data_file_path: str = DATA_FILE_PATH, chunksize: int or None = None,
+                 backend: str = "pandas", database_path: str or None = None) -> None:
         """Lectura de la BD de Synergy Logistics.
+
+        Args:
+            compact (bool, optional): Si es True, las columnas de texto se guardan como
+                categoricas (codigos enteros + diccionario), year como int16 y total_value
+                como int64. Defaults to False.
+            use_cache (bool, optional): Si es True, se lee la caché binaria del CSV cuando es
+                valida y se reconstruye cuando no lo es. Defaults to True.
+            rebuild_cache (bool, optional): Si es True, se ignora la caché existente y se
+                vuelve a generar a partir del CSV. Defaults to False.
+            data_file_path (str, optional): Ruta del archivo CSV. Defaults to DATA_FILE_PATH.
+            chunksize (int or None, optional): Si se indica, la tabla no se carga en memoria: el CSV
+                se recorre en bloques de este número de filas y solo se conservan agregados
+                (dominios y cubo). Defaults to None.
+            backend (str, optional): 'pandas' (tabla en memoria) o 'sqlite' (base SQLite local con
+                indices; filtros, conteos, sumas y agrupaciones se resuelven en SQL sin cargar la
+                tabla). Defaults to "pandas".
+            database_path (str or None, optional): Ruta de la base con backend 'sqlite'. Defaults
+                to None (junto al CSV).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend '{backend}' no soportado. Opciones: {BACKENDS}")
+        self.data_file_path = data_file_path
+        self.compact = compact
+        self.chunksize = chunksize
+        # Filas anexadas con append() (en modo por bloques se recorren después del CSV)
+        self._appended_rows = []
+        self.database = None
+        if backend == "sqlite":
+            # Sin tabla en memoria: las consultas se traducen a SQL
+            self.database = SynergyLogisticsSQLite(data_file_path, database_path, rebuild=rebuild_cache)
+            self.SYNERGY_DB = None
+            return
+        if self.streaming:
+            # Modo por bloques: sin tabla en memoria, agregados calculados en un recorrido
+            self.SYNERGY_DB = None
+            self._scan_chunks()
+            return
+        synergy_db = None
+        if use_cache and not rebuild_cache:
+            synergy_db = load_cached_table(data_file_path, compact)
+        if synergy_db is None:
+            synergy_db = read_synergy_csv(data_file_path)
+            if use_cache:
+                try:
+                    save_cached_table(synergy_db, data_file_path, COMPACT_NUMERIC_DTYPES)
+                except OSError as error:
+                    print(f"No fue posible guardar la caché de {data_file_path}: {error}")
+        if compact:
+            synergy_db = compact_table(synergy_db)
+        self.SYNERGY_DB = synergy_db
+
+    @property
+    def SYNERGY_DB(self) -> DataFrame:
+        """Tabla con los registros de Synergy Logistics."""
+        return self._synergy_db
+
+    @SYNERGY_DB.setter
+    def SYNERGY_DB(self, synergy_db: DataFrame) -> None:
+        # Al reemplazar la tabla, los dominios calculados dejan de ser validos
+        self._synergy_db = synergy_db
+        self._domains = None
+        self._inverted_index = None
+        self._cube = None
+        self._route_matrix = None
+        self._column_stats = None
+        self._time_series = {}
+
+    @property
+    def streaming(self) -> bool:
+        """
+        Indica si la tabla no está en memoria: se recorre por bloques desde el CSV o se consulta
+        en la base SQLite.
+        """
+        return self.chunksize is not None or self.database is not None
+
+    def iter_chunks(self) -> Iterator[DataFrame]:
+        """Recorre la tabla por bloques leidos del CSV (modo por bloques).
+
+        Yields:
+            Iterator[DataFrame]: Bloques de la tabla.
+        """
+        if self.database is not None:
+            for chunk in self.database.iter_chunks(self.chunksize):
+                yield compact_table(chunk) if self.compact else chunk
+            return
+        yield from read_synergy_chunks(self.data_file_path, self.chunksize, self.compact)
+        yield from self._appended_rows
+
+    @instrumented(rows=lambda result, self: int(self._cube.cells["frecuency"].sum()))
+    def _scan_chunks(self) -> None:
+        """
+        Recorre el CSV una vez y acumula los dominios de cada columna y las celdas del cubo.
+        La memoria usada depende del número de valores distintos, no del número de filas.
+        """
+        domains = {column: set() for column in CATEGORY_COLUMNS}
+        min_year = None
+        cube = None
+        for chunk in self.iter_chunks():
+            for column in CATEGORY_COLUMNS:
+                domains[column].update(chunk[column].unique())
+            chunk_min_year = chunk["year"].min()
+            min_year = chunk_min_year if min_year is None else min(min_year, chunk_min_year)
+            if cube is None:
+                cube = SynergyLogisticsCube(chunk)
+            else:
+                cube.add_cells(SynergyLogisticsCube(chunk).cells)
+        domains["year"] = set(range(min_year, datetime.now().year))
+        self._domains = domains
+        self._cube = cube
+
+    @property
+    def domains(self) -> Dict[str, Set]:
+        """
+        Valores validos para los filtros de cada columna. Se calculan una sola vez
+        por tabla y se guardan como conjuntos para validar filtros en O(1).
+
+        Returns:
+            Dict[str, Set]: Conjunto de valores validos por columna (incluye 'year').
+        """
+        if self._domains is None:
+            self.refresh_domains()
+        return self._domains
+
+    def refresh_domains(self) -> None:
+        """
+        Recalcula los valores validos de cada columna. Solo es necesario llamarla
+        si SYNERGY_DB se modifica sin reasignarse.
+        """
+        if self.database is not None:
+            # Valores distintos resueltos en la base (columnas con indice)
+            domains = self.database.domains(CATEGORY_COLUMNS)
+            domains["year"] = set(range(self.database.min_value("year"), datetime.now().year))
+            self._domains = domains
+            return
+        if self.streaming:
+            self._scan_chunks()
+            return
+        routes_table = self.SYNERGY_DB
+        domains = {column: set(routes_table[column].unique()) for column in CATEGORY_COLUMNS}
+        domains["year"] = set(range(routes_table["year"].min(), datetime.now().year))
+        self._domains = domains
+
+    @property
+    def n_rows(self) -> int:
+        """Número de registros de la tabla (en memoria, en el CSV por bloques o en la base)."""
+        if self.database is not None:
+            return self.database.measures({}, [])[0]
+        if self.streaming:
+            return int(self.cube.cells["frecuency"].sum())
+        return len(self.SYNERGY_DB)
+
+    @property
+    def inverted_index(self) -> SynergyLogisticsIndex:
+        """
+        Indice invertido (posiciones de fila por valor) de las columnas filtrables.
+        Se construye en la primera consulta y se descarta al reemplazar SYNERGY_DB.
+
+        Returns:
+            SynergyLogisticsIndex: Indice de la tabla actual.
+        """
+        if self._inverted_index is None:
+            self._inverted_index = SynergyLogisticsIndex(self.SYNERGY_DB, INDEX_COLUMNS)
+        return self._inverted_index
+
+    @property
+    def cube(self) -> SynergyLogisticsCube:
+        """
+        Cubo con frecuencia y valor total por dirección, año, origen, destino, medio de
+        transporte y producto. Se construye en la primera consulta y se descarta al
+        reemplazar SYNERGY_DB.
+
+        Returns:
+            SynergyLogisticsCube: Cubo de la tabla actual.
+        """
+        if self._cube is None:
+            if self.database is not None:
+                # Celdas calculadas con GROUP BY en la base
+                self._cube = SynergyLogisticsCube.from_cells(self.database.aggregate(CUBE_DIMENSIONS, {}, []))
+            else:
+                self._cube = SynergyLogisticsCube(self.SYNERGY_DB)
+        return self._cube
+
+    @property
+    def route_matrix(self) -> SynergyLogisticsRouteMatrix:
+        """
+        Matrices pais x pais de frecuencia y valor total por dirección y año. Se llenan con
+        las celdas del cubo en la primera consulta y se descartan al reemplazar SYNERGY_DB o
+        anexar registros.
+
+        Returns:
+            SynergyLogisticsRouteMatrix: Matrices de la tabla actual.
+        """
+        if self._route_matrix is None:
+            self._route_matrix = SynergyLogisticsRouteMatrix(self.cube.cells)
+        return self._route_matrix
+
+    def time_series(self, freq: str = "year") -> SynergyLogisticsTimeSeries:
         """
-        self.SYNERGY_DB = pd.read_csv(DATA_FILE_PATH, index_col="register_id")
-        # Convert date column to datetime objects
-        self.SYNERGY_DB["date"] = pd.to_datetime(self.SYNERGY_DB["date"])
+        Series de tiempo por año, trimestre o mes (ver SynergyLogisticsTimeSeries). Las filas
+        se agrupan una sola vez por periodo; se descartan al reemplazar SYNERGY_DB.
+
+        Args:
+            freq (str, optional): 'year', 'quarter' o 'month'. Defaults to "year".
 
+        Returns:
+            SynergyLogisticsTimeSeries: Series de la tabla actual.
+        """
+        if freq not in self._time_series:
+            if self.streaming:
+                time_series = SynergyLogisticsTimeSeries(None, freq)
+                for chunk in self.iter_chunks():
+                    time_series.add_rows(chunk)
+            else:
+                time_series = SynergyLogisticsTimeSeries(self.SYNERGY_DB, freq)
+            self._time_series[freq] = time_series
+        return self._time_series[freq]
+
+    @instrumented(rows=lambda result, self, rows: len(rows))
+    def append(self, rows: DataFrame) -> List[Tuple]:
+        """
+        Anexa registros nuevos a la tabla y actualiza de forma incremental los dominios, el
+        indice invertido, el cubo y las series de tiempo (si ya estaban calculados), sin volver
+        a leer el CSV.
+
+        Args:
+            rows (DataFrame): Registros con las columnas del CSV. register_id puede venir como
+                columna o como indice, y date como texto DD/MM/YY o como datetime.
+
+        Returns:
+            List[Tuple]: Particiones (dirección, año) del reporte que cambiaron, incluyendo los
+                casos None (todas las direcciones / todos los años).
+        """
+        rows = self._prepare_rows(rows)
+        if len(rows) == 0:
+            return []
+        if self.database is not None:
+            self.database.append(rows)
+        elif self.streaming:
+            self._appended_rows.append(rows)
+        else:
+            synergy_db = self.SYNERGY_DB
+            if self.compact:
+                synergy_db, rows = align_categories(synergy_db, rows)
+            # Se asigna directamente para no descartar las estructuras calculadas
+            self._synergy_db = pd.concat([synergy_db, rows[synergy_db.columns]])
+            if self._inverted_index is not None:
+                self._inverted_index.extend(rows)
+        if self._domains is not None:
+            for column in CATEGORY_COLUMNS:
+                self._domains[column].update(rows[column].unique())
+            self._domains["year"].update(range(rows["year"].min(), datetime.now().year))
+        if self._cube is not None:
+            self._cube.add_cells(SynergyLogisticsCube(rows).cells)
+        for time_series in self._time_series.values():
+            time_series.add_rows(rows)
+        # Puede haber paises nuevos: las matrices se vuelven a llenar desde el cubo
+        self._route_matrix = None
+        self._column_stats = None
+        # Particiones afectadas: cada (dirección, año) nuevo y sus totales
+        changed_partitions = set()
+        for direction, year in rows[["direction", "year"]].drop_duplicates().itertuples(index=False):
+            for partition_direction in [None, str(direction)]:
+                for partition_year in [None, int(year)]:
+                    changed_partitions.add((partition_direction, partition_year))
+        return sorted(changed_partitions, key=lambda partition: (partition[0] or "", partition[1] or 0))
+
+    def ingest_delta(self, data_file_path: str) -> List[Tuple]:
+        """Anexa los registros de un CSV con el mismo formato que el de Synergy Logistics.
+
+        Args:
+            data_file_path (str): Ruta del CSV con registros nuevos.
+
+        Returns:
+            List[Tuple]: Particiones (dirección, año) del reporte que cambiaron.
+        """
+        return self.append(read_synergy_csv(data_file_path))
+
+    def _prepare_rows(self, rows: DataFrame) -> DataFrame:
+        """Da a registros nuevos el mismo formato que la tabla cargada.
+
+        Args:
+            rows (DataFrame): Registros nuevos.
+
+        Returns:
+            DataFrame: Registros indexados por register_id, con fechas convertidas.
+        """
+        if "register_id" in rows.columns:
+            rows = rows.set_index("register_id")
+        if not pd.api.types.is_datetime64_dtype(rows["date"].dtype):
+            rows = rows.assign(date=parse_dates(rows["date"]))
+        if self.compact:
+            rows = compact_table(rows)
+        return rows
+
+    def _valid_equality_filters(self, **filters) -> Dict[str, object]:
+        """
+        Conserva solo los filtros de igualdad con valor valido. Igual que en filter_routes_df,
+        los filtros invalidos se ignoran y se indica en consola.
+
+        Returns:
+            Dict[str, object]: Columna -> valor de los filtros validos.
+        """
+        domains = self.domains
+        valid_filters = {}
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if value in domains[column]:
+                valid_filters[column] = value
+            elif column == "year":
+                print(f"El valor '{value}' no es un año valido para la columna year.")
+            else:
+                print(f"El valor '{value}' no es un filtro valido para la columna {column}.")
+        return valid_filters
+
+    @instrumented(rows=lambda result, self, *args, **kwargs: self.n_rows)
     def filter_routes_df(self, direction: str or None = None,
                          origin: str or None = None, destination: str or None = None,
                          start_year: int or None = None, end_year: int or None = None,
@@ -42,95 +471,320 @@ class SynergyLogisticsFilters():
         Returns:
             DataFrame:  Dataframe con columnas de la tabla que cumplen con los filtros indicados.
         """
+        equality_filters, range_filters = self._parse_filters(
+            direction=direction, origin=origin, destination=destination, start_year=start_year,
+            end_year=end_year, start_date=start_date, end_date=end_date, product=product,
+            transport_mode=transport_mode, company_name=company_name, min_value=min_value,
+            max_value=max_value)
+        return self._apply_filters(equality_filters, range_filters)
+
+    def _apply_filters(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> DataFrame:
+        """Corta la tabla con filtros ya validados por _parse_filters.
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            DataFrame: Filas que cumplen con los filtros.
+        """
+        if self.database is not None:
+            rows = self.database.select(equality_filters, range_filters)
+            return compact_table(rows) if self.compact else rows
+        if self.streaming:
+            # Aplicar los mismos filtros a cada bloque del CSV
+            return pd.concat(list(self.iter_filtered_chunks(equality_filters, range_filters)))
+        positions = self._positions(equality_filters, range_filters)
+        # Sin filtros se regresa la tabla completa; si no, se corta una sola vez
+        if positions is None:
+            return self.SYNERGY_DB
+        return self.SYNERGY_DB.iloc[positions]
+
+    def _positions(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> np.ndarray or None:
+        """
+        Posiciones de las filas que cumplen todos los filtros, sin copiar la tabla. Los filtros
+        de igualdad se intersectan en el indice (empezando por la lista más corta) y los de
+        rango se aplican después, del más selectivo al menos selectivo, solo sobre las
+        posiciones que siguen siendo candidatas.
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            np.ndarray or None: Posiciones ordenadas, o None si no hay filtros (toda la tabla).
+        """
         routes_table = self.SYNERGY_DB
-        # Get valid cases for string filters from unique values of each str column
-        direction_cases = list(routes_table["direction"].unique())
-        origin_countries = list(routes_table["origin"].unique())
-        destination_countries = list(routes_table["destination"].unique())
-        years = list(range(routes_table["year"].min(), datetime.now().year))
-        product_types = list(routes_table["product"].unique())
-        transport_modes = list(routes_table["transport_mode"].unique())
-        companies = list(routes_table["company_name"].unique())
+        # Intersectar posiciones de los filtros de igualdad
+        positions = self.inverted_index.lookup(equality_filters)
+        # Aplicar filtros de rango solo sobre las posiciones candidatas
+        for column, compare, bound in sorted(range_filters, key=lambda range_filter: self._selectivity(*range_filter)):
+            column_values = routes_table[column].to_numpy()
+            if positions is None:
+                positions = np.flatnonzero(compare(column_values, bound))
+            else:
+                positions = positions[compare(column_values[positions], bound)]
+        return positions
+
+    @property
+    def column_stats(self) -> Dict[str, Tuple]:
+        """
+        Minimo y maximo de las columnas con filtros de rango. Se calculan en la primera
+        consulta y se descartan al modificar la tabla.
+
+        Returns:
+            Dict[str, Tuple]: Columna -> (minimo, maximo).
+        """
+        if self._column_stats is None:
+            self._column_stats = {column: (self.SYNERGY_DB[column].min(), self.SYNERGY_DB[column].max())
+                                  for column in RANGE_COLUMNS}
+        return self._column_stats
+
+    def _selectivity(self, column: str, compare, bound) -> float:
+        """
+        Fracción estimada de filas que cumplen un filtro de rango, suponiendo valores
+        distribuidos uniformemente entre el minimo y el maximo de la columna.
+
+        Args:
+            column (str): Columna del filtro.
+            compare: Comparación (operator.ge u operator.le).
+            bound: Limite del filtro.
+
+        Returns:
+            float: Fracción entre 0 y 1.
+        """
+        if self.streaming:
+            return 1.0
+        low, high = self.column_stats[column]
+        if high == low:
+            return 1.0
+        if compare in (operator.ge, operator.gt):
+            fraction = (high - bound) / (high - low)
+        else:
+            fraction = (bound - low) / (high - low)
+        return min(max(float(fraction), 0.0), 1.0)
+
+    def _measures(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> Tuple[int, int]:
+        """
+        Número de transacciones y suma de valor de las filas que cumplen los filtros, sin
+        formar la tabla filtrada. Si todos los filtros son de igualdad sobre dirección, año y
+        paises, se lee de la matriz de rutas; si son sobre otras dimensiones del cubo, se
+        responde desde el cubo.
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad validos (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            Tuple[int, int]: Frecuencia y suma de valor.
+        """
+        if not range_filters and set(equality_filters) <= set(MATRIX_DIMENSIONS):
+            return self.route_matrix.measures(equality_filters)
+        if not range_filters and set(equality_filters) <= set(CUBE_DIMENSIONS):
+            return self.cube.total(equality_filters)
+        if self.database is not None:
+            return self.database.measures(equality_filters, range_filters)
+        if self.streaming:
+            frecuency, total_value = 0, 0
+            for chunk in self.iter_filtered_chunks(equality_filters, range_filters):
+                frecuency += len(chunk)
+                total_value += int(chunk["total_value"].sum())
+            return frecuency, total_value
+        values = self.SYNERGY_DB["total_value"].to_numpy()
+        positions = self._positions(equality_filters, range_filters)
+        if positions is None:
+            return len(values), int(values.sum())
+        return len(positions), int(values[positions].sum())
+
+    def query(self) -> SynergyLogisticsQuery:
+        """Consulta encadenable sobre la tabla (ver SynergyLogisticsQuery).
+
+        Returns:
+            SynergyLogisticsQuery: Consulta sin filtros.
+        """
+        return SynergyLogisticsQuery(self)
+
+    def _parse_filters(self, direction: str or None = None,
+                       origin: str or None = None, destination: str or None = None,
+                       start_year: int or None = None, end_year: int or None = None,
+                       start_date: str or None = None, end_date: str or None = None,
+                       product: str or None = None, transport_mode: str or None = None,
+                       company_name: str or None = None, min_value: int or None = None,
+                       max_value: int or None = None) -> Tuple[Dict[str, object], List[Tuple]]:
+        """
+        Valida los argumentos de filter_routes_df y los separa en filtros de igualdad y de rango.
+        Los filtros invalidos se ignoran y se indica en consola.
+
+        Returns:
+            Tuple[Dict[str, object], List[Tuple]]: Filtros de igualdad (columna -> valor) y filtros
+                de rango (columna, comparación, limite).
+        """
+        # Valid cases for each filter (precomputed at load)
+        domains = self.domains
+        direction_cases = domains["direction"]
+        origin_countries = domains["origin"]
+        destination_countries = domains["destination"]
+        years = domains["year"]
+        product_types = domains["product"]
+        transport_modes = domains["transport_mode"]
+        companies = domains["company_name"]
         date_format = '%d/%m/%Y'
+        # Filtros de igualdad (se resuelven con el indice invertido) y de rango
+        equality_filters = {}
+        range_filters = []
         # Add filter to column if valid input is given
         # Dirección
         if direction is not None:
             if direction in direction_cases:
-                routes_table=routes_table[routes_table["direction"] == direction]
+                equality_filters["direction"] = direction
             else:
                 print(f"El valor '{direction}' no es un filtro valido para la columna direction.")
         # Origen
         if origin is not None:
             if origin in origin_countries:
-                routes_table=routes_table[routes_table["origin"] == origin]
+                equality_filters["origin"] = origin
             else:
                 print(f"El valor '{origin}' no es un filtro valido para la columna origin.")
         # Destino
         if destination is not None:
             if destination in destination_countries:
-                routes_table=routes_table[routes_table["destination"] == destination]
+                equality_filters["destination"] = destination
             else:
                 print(f"El valor '{destination}' no es un filtro valido para la columna destination.")
         # Year
         if start_year is not None:
             if start_year in years:
-                routes_table=routes_table[routes_table["year"] >= start_year]
+                range_filters.append(("year", operator.ge, start_year))
             else:
                 print(f"El valor '{start_year}' no es un año valido para la columna year.")
         if end_year is not None:
             if end_year in years:
-                routes_table=routes_table[routes_table["year"] <= end_year]
+                range_filters.append(("year", operator.le, end_year))
             else:
                 print(f"El valor '{end_year}' no es un año valido para la columna year.")
+        # Un solo año se resuelve también con el indice
+        if start_year is not None and start_year == end_year and len(range_filters) == 2:
+            equality_filters["year"] = start_year
+            range_filters = []
         # Date
         if start_date is not None:
             try:
-                datetime.strptime(start_date, date_format)
-                routes_table=routes_table[routes_table["date"] >= start_date]
+                start_datetime = datetime.strptime(start_date, date_format)
+                range_filters.append(("date", operator.ge, np.datetime64(start_datetime)))
             except ValueError:
                 print("Fecha invalida. Debe usarse el formato DD/MM/YYYY")
         if end_date is not None:
             try:
-                datetime.strptime(end_date, date_format)
-                routes_table=routes_table[routes_table["date"] <= end_date]
+                end_datetime = datetime.strptime(end_date, date_format)
+                range_filters.append(("date", operator.le, np.datetime64(end_datetime)))
             except ValueError:
                 print("Fecha invalida. Debe usarse el formato DD/MM/YYYY")
         # Producto
         if product is not None:
             if product in product_types:
-                routes_table=routes_table[routes_table["product"] == product]
+                equality_filters["product"] = product
             else:
                 print(f"El valor '{product}' no es un filtro valido para la columna product.")
         # Modo de transporte
         if transport_mode is not None:
             if transport_mode in transport_modes:
-                routes_table=routes_table[routes_table["transport_mode"] == transport_mode]
+                equality_filters["transport_mode"] = transport_mode
             else:
-                print(f"El valor '{transport_mode}' no es un filtro valido para la columna product.")
+                print(f"El valor '{transport_mode}' no es un filtro valido para la columna transport_mode.")
         # Nombre de Compañia
         if company_name is not None:
             if company_name in companies:
-                routes_table=routes_table[routes_table["company_name"] == company_name]
+                equality_filters["company_name"] = company_name
             else:
                 print(f"El valor '{company_name}' no es un filtro valido para la columna company_name.")
         # Valor total
         if min_value is not None:
-            routes_table=routes_table[routes_table["total_value"] >= min_value]
+            range_filters.append(("total_value", operator.ge, min_value))
         if max_value is not None:
-            routes_table=routes_table[routes_table["total_value"] <= max_value]
+            range_filters.append(("total_value", operator.le, max_value))
+
+
+        return equality_filters, range_filters
+
+    def iter_filtered_chunks(self, equality_filters: Dict[str, object],
+                             range_filters: List[Tuple]) -> Iterator[DataFrame]:
+        """Recorre los bloques del CSV aplicando filtros ya validados (modo por bloques).
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
 
-        return routes_table
+        Yields:
+            Iterator[DataFrame]: Filas de cada bloque que cumplen con los filtros.
+        """
+        for chunk in self.iter_chunks():
+            mask = np.ones(len(chunk), dtype=bool)
+            for column, value in equality_filters.items():
+                mask &= (chunk[column] == value).to_numpy()
+            for column, compare, bound in range_filters:
+                mask &= compare(chunk[column].to_numpy(), bound)
+            yield chunk[mask]
         
 
+    def memory_report(self) -> DataFrame:
+        """
+        Reporta la memoria usada por cada columna de la tabla. Para columnas compactas
+        se incluye también la memoria que usarían con su tipo original (object / int64),
+        lo que permite ver la reducción obtenida. Solo aplica con la tabla en memoria: en modo
+        por bloques o con backend 'sqlite' se lanza ValueError.
+
+        Returns:
+            DataFrame: Tipo de dato, bytes actuales y bytes en representación original por columna,
+                con una fila 'total' al final.
+        """
+        if self.streaming:
+            raise ValueError("memory_report() requiere la tabla en memoria; en modo por bloques o con "
+                             "backend 'sqlite' no se carga la tabla.")
+        routes_table = self.SYNERGY_DB
+        report = {}
+        for column in routes_table.columns:
+            column_values = routes_table[column]
+            current_bytes = column_values.memory_usage(deep=True, index=False)
+            if isinstance(column_values.dtype, pd.CategoricalDtype):
+                original_bytes = column_values.astype(object).memory_usage(deep=True, index=False)
+            elif column == "year":
+                original_bytes = column_values.astype("int64").memory_usage(deep=True, index=False)
+            else:
+                original_bytes = current_bytes
+            report[column] = {"dtype": str(column_values.dtype), "bytes": current_bytes,
+                              "original_bytes": original_bytes}
+        report = pd.DataFrame.from_dict(report, orient="index")
+        report.loc["total"] = ["", report["bytes"].sum(), report["original_bytes"].sum()]
+        return report
+
+    @instrumented(rows=None)
     def get_unique_values(self, category:str) -> List:
         """Genera lista con valores unicos de columna de la base de datos.
 
         Args:
-            category (str): Nombre de la columna.
+            category (str): Nombre de la columna (con backend 'sqlite', una de INDEX_COLUMNS).
 
         Returns:
             List: Valores unicos en columna de la tabla.
         """
+        if self.database is not None:
+            if category not in self.database.columns:
+                print("La categoría indicada no existe dentro de la Base de Datos")
+                return []
+            # Solo columnas de filtro (con dominio acotado); p. ej. register_id recorrería toda la tabla
+            if category not in INDEX_COLUMNS:
+                print(f"Con backend 'sqlite' solo se consultan los valores de {INDEX_COLUMNS}")
+                return []
+            return self.database.distinct(category)
+        if self.streaming:
+            # Valores distintos en orden de aparición, acumulados bloque por bloque
+            unique_column_values = {}
+            for chunk in self.iter_chunks():
+                if category not in chunk.columns:
+                    print("La categoría indicada no existe dentro de la Base de Datos")
+                    return []
+                unique_column_values.update(dict.fromkeys(chunk[category].unique()))
+            return list(unique_column_values)
         # Si elemento es columna de la tabla, obtiene valores distintos. 
         if category in self.SYNERGY_DB.columns.values.tolist():
             unique_column_values = list(self.SYNERGY_DB[category].unique())
@@ -0,0 +1,93 @@
+from typing import Dict, List
+import numpy as np
+from pandas.core.frame import DataFrame
+
+
+class SynergyLogisticsIndex():
+    """
+    Indice invertido sobre la tabla de Synergy Logistics. Para cada valor distinto de cada
+    columna indexada se guarda el arreglo ordenado de posiciones de fila donde aparece, de modo
+    que una consulta con varios filtros de igualdad se resuelve intersectando arreglos y
+    cortando la tabla una sola vez.
+    """
+    def __init__(self, routes_table: DataFrame, columns: List[str]) -> None:
+        """Construye las listas de posiciones de cada columna.
+
+        Args:
+            routes_table (DataFrame): Tabla de Synergy Logistics.
+            columns (List[str]): Columnas a indexar.
+        """
+        self.n_rows = 0
+        self.postings = {column: {} for column in columns}
+        self.extend(routes_table)
+
+    def extend(self, new_rows: DataFrame) -> None:
+        """
+        Agrega al indice filas nuevas que se anexaron al final de la tabla. Sus posiciones
+        son mayores a las existentes, por lo que las listas siguen ordenadas.
+
+        Args:
+            new_rows (DataFrame): Filas anexadas a la tabla.
+        """
+        offset = self.n_rows
+        self.n_rows += len(new_rows)
+        # int32 es suficiente mientras la tabla tenga menos de 2^31 filas
+        position_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        for column, postings in self.postings.items():
+            column_postings = new_rows.groupby(column, sort=False, observed=True).indices
+            for value, positions in column_postings.items():
+                positions = (positions + offset).astype(position_dtype, copy=False)
+                if value in postings:
+                    positions = np.concatenate([postings[value], positions])
+                postings[value] = positions
+
+    def positions(self, column: str, value) -> np.ndarray:
+        """Posiciones ordenadas de las filas donde la columna toma el valor indicado.
+
+        Args:
+            column (str): Columna indexada.
+            value: Valor buscado.
+
+        Returns:
+            np.ndarray: Posiciones de fila (vacio si el valor no aparece).
+        """
+        return self.postings[column].get(value, np.empty(0, dtype=np.int32))
+
+    def lookup(self, filters: Dict[str, object]) -> np.ndarray or None:
+        """
+        Intersecta las posiciones de todos los filtros de igualdad. Se empieza por la lista
+        más corta, de modo que el costo depende del filtro más selectivo.
+
+        Args:
+            filters (Dict[str, object]): Columna -> valor buscado.
+
+        Returns:
+            np.ndarray or None: Posiciones ordenadas que cumplen todos los filtros, o None si no
+                hay filtros (toda la tabla).
+        """
+        if not filters:
+            return None
+        postings = sorted((self.positions(column, value) for column, value in filters.items()), key=len)
+        result = postings[0]
+        for positions in postings[1:]:
+            if len(result) == 0:
+                break
+            result = intersect_sorted(result, positions)
+        return result
+
+
+def intersect_sorted(small: np.ndarray, large: np.ndarray) -> np.ndarray:
+    """Intersección de dos arreglos ordenados y sin repetidos mediante busqueda binaria.
+
+    Args:
+        small (np.ndarray): Arreglo más corto.
+        large (np.ndarray): Arreglo más largo.
+
+    Returns:
+        np.ndarray: Elementos de 'small' que también están en 'large'.
+    """
+    if len(large) == 0:
+        return large
+    found_at = np.searchsorted(large, small)
+    found_at[found_at == len(large)] = 0
+    return small[large[found_at] == small]
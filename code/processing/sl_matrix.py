@@ -0,0 +1,126 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+# Dimensiones de la matriz de rutas
+MATRIX_DIMENSIONS = ["direction", "year", "origin", "destination"]
+
+
+class SynergyLogisticsRouteMatrix():
+    """
+    Matrices densas pais x pais con el número de transacciones y el valor total de cada ruta,
+    una por dirección y año. Los paises (de origen y de destino) se codifican como enteros, de
+    modo que la medida de una ruta es una lectura en O(1) y el total de cada pais de origen o de
+    destino es la suma de una fila o de una columna de la matriz.
+    """
+    def __init__(self, cells: DataFrame) -> None:
+        """Llena las matrices a partir de celdas ya agregadas (por ejemplo, las del cubo).
+
+        Args:
+            cells (DataFrame): Celdas con las dimensiones de la matriz, 'frecuency' y 'total_value'.
+        """
+        origins = cells["origin"].astype(str).to_numpy()
+        destinations = cells["destination"].astype(str).to_numpy()
+        directions = cells["direction"].astype(str).to_numpy()
+        years = cells["year"].to_numpy()
+        # Códigos en el orden en que cada valor aparece en las celdas
+        self.countries = list(pd.unique(np.concatenate([origins, destinations])))
+        self.country_codes = {country: code for code, country in enumerate(self.countries)}
+        self.directions = list(pd.unique(directions))
+        self.direction_codes = {direction: code for code, direction in enumerate(self.directions)}
+        self.years = sorted(int(year) for year in pd.unique(years))
+        self.year_codes = {year: code for code, year in enumerate(self.years)}
+        n_countries = len(self.countries)
+        # Eje final: 0 = frecuencia, 1 = valor total
+        self.values = np.zeros((len(self.directions), len(self.years), n_countries, n_countries, 2), dtype=np.int64)
+        positions = (pd.Index(self.directions).get_indexer(directions),
+                     pd.Index(self.years).get_indexer(years),
+                     pd.Index(self.countries).get_indexer(origins),
+                     pd.Index(self.countries).get_indexer(destinations))
+        np.add.at(self.values[..., 0], positions, cells["frecuency"].to_numpy())
+        np.add.at(self.values[..., 1], positions, cells["total_value"].to_numpy())
+        self._matrices = {}
+
+    def matrix(self, direction: str or None = None, year: int or None = None) -> np.ndarray:
+        """
+        Matriz de una dirección y un año (None suma todas las direcciones o todos los años).
+        Las sumas se calculan una vez por combinación.
+
+        Args:
+            direction (str or None, optional): Dirección de transacción. Defaults to None.
+            year (int or None, optional): Año de transacciones. Defaults to None.
+
+        Returns:
+            np.ndarray: Arreglo (origen, destino, 2) con frecuencia y valor total.
+        """
+        cache_key = (direction, year)
+        if cache_key not in self._matrices:
+            values = self.values
+            # Una dirección o un año sin registros tiene la matriz en ceros
+            if direction is not None:
+                code = self.direction_codes.get(direction)
+                values = values[code:code + 1] if code is not None else values[:0]
+            if year is not None:
+                code = self.year_codes.get(year)
+                values = values[:, code:code + 1] if code is not None else values[:, :0]
+            self._matrices[cache_key] = values.sum(axis=(0, 1))
+        return self._matrices[cache_key]
+
+    def measures(self, filters: Dict[str, object] or None = None) -> Tuple[int, int]:
+        """Número de transacciones y valor total de una ruta, de un pais o de un periodo.
+
+        Args:
+            filters (Dict[str, object] or None, optional): Dimensión -> valor, solo con
+                dimensiones de MATRIX_DIMENSIONS. Defaults to None.
+
+        Returns:
+            Tuple[int, int]: Frecuencia y suma de valor.
+        """
+        filters = filters or {}
+        matrix = self.matrix(filters.get("direction"), filters.get("year"))
+        # Fila del pais de origen y columna del pais de destino (sin filtro = todas)
+        index = []
+        for dimension in ["origin", "destination"]:
+            if dimension not in filters:
+                index.append(slice(None))
+                continue
+            code = self.country_codes.get(str(filters[dimension]))
+            if code is None:
+                return 0, 0
+            index.append(slice(code, code + 1))
+        measures = matrix[tuple(index)].reshape(-1, 2).sum(axis=0)
+        return int(measures[0]), int(measures[1])
+
+    def table(self, by: List[str], keys: List, direction: str or None = None, year: int or None = None) -> DataFrame:
+        """
+        Frecuencia y valor total de cada llave, en el orden de las llaves. Con 'origin' o
+        'destination' se suman las filas o las columnas de la matriz; con ambos se lee cada ruta.
+
+        Args:
+            by (List[str]): ['origin'], ['destination'] u ['origin', 'destination'].
+            keys (List): Paises, o tuplas (origen, destino) si by tiene las dos columnas. Las
+                llaves sin registros quedan en 0.
+            direction (str or None, optional): Dirección de transacción. Defaults to None.
+            year (int or None, optional): Año de transacciones. Defaults to None.
+
+        Returns:
+            DataFrame: Columnas 'frecuency' y 'total_value', una fila por llave.
+        """
+        matrix = self.matrix(direction, year)
+        if by == ["origin", "destination"]:
+            origin_codes = np.array([self.country_codes.get(origin, -1) for origin, _ in keys], dtype=np.int64)
+            destination_codes = np.array([self.country_codes.get(destination, -1) for _, destination in keys],
+                                         dtype=np.int64)
+            values = matrix[origin_codes, destination_codes]
+            found = (origin_codes >= 0) & (destination_codes >= 0)
+        elif by in (["origin"], ["destination"]):
+            # Total de cada pais: suma de su fila (origen) o de su columna (destino)
+            totals = matrix.sum(axis=1 if by == ["origin"] else 0)
+            codes = np.array([self.country_codes.get(key, -1) for key in keys], dtype=np.int64)
+            values = totals[codes]
+            found = codes >= 0
+        else:
+            raise ValueError(f"La matriz de rutas no agrupa por {by}.")
+        values = np.where(found[:, None], values, 0)
+        return DataFrame({"frecuency": values[:, 0], "total_value": values[:, 1]})
@@ -0,0 +1,175 @@
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from pandas.core.frame import DataFrame
+
+from processing.sl_cube import CUBE_DIMENSIONS
+
+if TYPE_CHECKING:
+    from processing.sl_filters import SynergyLogisticsFilters
+
+
+class SynergyLogisticsQuery():
+    """
+    Consulta encadenable sobre la tabla de Synergy Logistics. Cada método agrega un filtro y
+    regresa una consulta nueva; no se filtra nada hasta pedir el resultado con rows(),
+    positions() o agg(). Al ejecutarse, los filtros de igualdad se resuelven intersectando
+    las listas del indice invertido (de la más corta a la más larga) y los de rango se aplican
+    en orden de selectividad estimada sobre las posiciones candidatas, sin tablas intermedias.
+
+    Ejemplo:
+        service.query().direction("Exports").year(2019).route("Japan", "China").agg()
+    """
+    def __init__(self, source: "SynergyLogisticsFilters", equality: Dict[str, object] or None = None,
+                 ranges: Dict[str, object] or None = None) -> None:
+        """Crea la consulta.
+
+        Args:
+            source (SynergyLogisticsFilters): Tabla sobre la que se consulta.
+            equality (Dict[str, object] or None, optional): Filtros de igualdad (columna -> valor).
+                Defaults to None.
+            ranges (Dict[str, object] or None, optional): Argumentos de rango de filter_routes_df
+                (start_year, end_year, start_date, end_date, min_value, max_value). Defaults to None.
+        """
+        self.source = source
+        self._equality = dict(equality or {})
+        self._ranges = dict(ranges or {})
+
+    def _where(self, column: str, value) -> "SynergyLogisticsQuery":
+        # Un valor None no filtra, igual que en filter_routes_df
+        if value is None:
+            return self
+        return SynergyLogisticsQuery(self.source, {**self._equality, column: value}, self._ranges)
+
+    def _between(self, **bounds) -> "SynergyLogisticsQuery":
+        bounds = {argument: bound for argument, bound in bounds.items() if bound is not None}
+        return SynergyLogisticsQuery(self.source, self._equality, {**self._ranges, **bounds})
+
+    def direction(self, direction: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por dirección (Imports o Exports)."""
+        return self._where("direction", direction)
+
+    def origin(self, origin: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por pais de origen."""
+        return self._where("origin", origin)
+
+    def destination(self, destination: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por pais de destino."""
+        return self._where("destination", destination)
+
+    def route(self, origin: str or None, destination: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por ruta (pais de origen y de destino)."""
+        return self.origin(origin).destination(destination)
+
+    def year(self, year: int or None) -> "SynergyLogisticsQuery":
+        """Filtra por un año."""
+        return self._where("year", year)
+
+    def years(self, start_year: int or None = None, end_year: int or None = None) -> "SynergyLogisticsQuery":
+        """Filtra por periodo de años (inclusivo)."""
+        return self._between(start_year=start_year, end_year=end_year)
+
+    def dates(self, start_date: str or None = None, end_date: str or None = None) -> "SynergyLogisticsQuery":
+        """Filtra por periodo de fechas con formato DD/MM/YYYY (inclusivo)."""
+        return self._between(start_date=start_date, end_date=end_date)
+
+    def product(self, product: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por tipo de producto."""
+        return self._where("product", product)
+
+    def transport_mode(self, transport_mode: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por medio de transporte."""
+        return self._where("transport_mode", transport_mode)
+
+    def company(self, company_name: str or None) -> "SynergyLogisticsQuery":
+        """Filtra por nombre de compañia."""
+        return self._where("company_name", company_name)
+
+    def value_between(self, min_value: int or None = None, max_value: int or None = None) -> "SynergyLogisticsQuery":
+        """Filtra por valor total (inclusivo)."""
+        return self._between(min_value=min_value, max_value=max_value)
+
+    def filters(self) -> Tuple[Dict[str, object], List[Tuple]]:
+        """
+        Valida los filtros de la consulta. Los filtros invalidos se ignoran y se indica en
+        consola, igual que en filter_routes_df.
+
+        Returns:
+            Tuple[Dict[str, object], List[Tuple]]: Filtros de igualdad validos y filtros de rango.
+        """
+        equality_filters = self.source._valid_equality_filters(**self._equality)
+        range_equality_filters, range_filters = self.source._parse_filters(**self._ranges)
+        # Un periodo de un solo año se resuelve como igualdad
+        equality_filters.update(range_equality_filters)
+        return equality_filters, range_filters
+
+    def explain(self) -> List[Tuple[str, str, float]]:
+        """
+        Orden en que se evaluarán los filtros: los de igualdad por tamaño de su lista en el
+        indice y después los de rango por selectividad estimada.
+
+        Returns:
+            List[Tuple[str, str, float]]: (columna, tipo de filtro, fracción estimada de filas).
+        """
+        equality_filters, range_filters = self.filters()
+        if self.source.streaming:
+            # Sin tabla en memoria no hay indice: los filtros se aplican juntos a cada bloque
+            plan = [(column, "==", 1.0) for column in equality_filters]
+        else:
+            n_rows = max(self.source.inverted_index.n_rows, 1)
+            plan = sorted(((column, "==", len(self.source.inverted_index.positions(column, value)) / n_rows)
+                           for column, value in equality_filters.items()), key=lambda step: step[2])
+        ranges = sorted(((column, compare.__name__, self.source._selectivity(column, compare, bound))
+                         for column, compare, bound in range_filters), key=lambda step: step[2])
+        return plan + ranges
+
+    def positions(self):
+        """
+        Posiciones de las filas que cumplen la consulta (None = toda la tabla). Solo existen con
+        la tabla en memoria: en modo por bloques o con backend 'sqlite' se lanza ValueError (las
+        filas se obtienen con rows()).
+        """
+        if self.source.streaming:
+            raise ValueError("positions() requiere la tabla en memoria; en modo por bloques o con "
+                             "backend 'sqlite' use rows() o agg().")
+        return self.source._positions(*self.filters())
+
+    def rows(self) -> DataFrame:
+        """Filas que cumplen la consulta, cortando la tabla una sola vez.
+
+        Returns:
+            DataFrame: Tabla filtrada.
+        """
+        return self.source._apply_filters(*self.filters())
+
+    def agg(self, count: bool = True, value: bool = True, by: List[str] or str or None = None) -> Dict[str, int] or DataFrame:
+        """
+        Número de transacciones ('frecuency') y/o suma de valor ('total_value') de la consulta,
+        sin formar la tabla filtrada cuando no es necesario.
+
+        Args:
+            count (bool, optional): Incluir número de transacciones. Defaults to True.
+            value (bool, optional): Incluir suma de valor. Defaults to True.
+            by (List[str] or str or None, optional): Columnas para agrupar. Defaults to None.
+
+        Returns:
+            Dict[str, int] or DataFrame: Medidas pedidas; con 'by', una tabla con las columnas de
+                agrupación y las medidas, en el orden en que cada grupo aparece en la tabla.
+        """
+        measures = [measure for measure, included in [("frecuency", count), ("total_value", value)] if included]
+        equality_filters, range_filters = self.filters()
+        if by is None:
+            frecuency, total_value = self.source._measures(equality_filters, range_filters)
+            return {measure: result for measure, result in [("frecuency", frecuency), ("total_value", total_value)]
+                    if measure in measures}
+        if isinstance(by, str):
+            by = [by]
+        if not range_filters and set(by) <= set(CUBE_DIMENSIONS) and set(equality_filters) <= set(CUBE_DIMENSIONS):
+            grouped = self.source.cube.rollup(by, equality_filters)
+        elif self.source.database is not None:
+            grouped = self.source.database.aggregate(by, equality_filters, range_filters)
+        else:
+            grouped = (self.source._apply_filters(equality_filters, range_filters)
+                       .groupby(by, sort=False, observed=True)["total_value"]
+                       .agg(frecuency="size", total_value="sum")
+                       .reset_index())
+        return grouped[by + measures]
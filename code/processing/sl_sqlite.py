@@ -0,0 +1,278 @@
+import operator
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Set, Tuple
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+from processing.sl_cache import source_key
+
+# Versión del esquema de la base. Cambiarla obliga a reconstruir las bases existentes.
+SQLITE_VERSION = 1
+# Tabla con los registros del CSV y vista que incluye los registros anexados
+ROUTES_TABLE = "routes"
+ROUTES_VIEW = "all_routes"
+# Columnas con indice en la base
+SQL_INDEX_COLUMNS = ["direction", "year", "origin", "destination", "transport_mode"]
+# Comparaciones de los filtros de rango -> operador de SQL
+SQL_OPERATORS = {operator.ge: ">=", operator.gt: ">", operator.le: "<=", operator.lt: "<"}
+# Formato en que se guardan las fechas (texto ordenable)
+SQL_DATE_FORMAT = "%Y-%m-%d"
+# Filas por bloque al cargar el CSV y al leer resultados grandes
+SQL_CHUNKSIZE = 100_000
+
+
+def database_path_for(data_file_path: str) -> str:
+    """Ruta de la base SQLite asociada a un archivo CSV (junto al archivo).
+
+    Args:
+        data_file_path (str): Ruta del archivo CSV.
+
+    Returns:
+        str: Ruta de la base.
+    """
+    folder, file_name = os.path.split(os.path.abspath(data_file_path))
+    return os.path.join(folder, f".{file_name}.sqlite")
+
+
+def sql_param(value: object) -> object:
+    """Valor de un filtro como parametro de SQLite (escalares de NumPy y fechas incluidos)."""
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value).strftime(SQL_DATE_FORMAT)
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(SQL_DATE_FORMAT)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def sql_rows(routes_table: DataFrame, columns: List[str], first_position: int) -> List[Tuple]:
+    """Filas de una tabla como tuplas de valores de Python, con su posición al inicio."""
+    column_values = [np.arange(first_position, first_position + len(routes_table)).tolist()]
+    for column in columns:
+        values = routes_table[column]
+        if column == "date":
+            values = values.dt.strftime(SQL_DATE_FORMAT)
+        column_values.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*column_values))
+
+
+class SynergyLogisticsSQLite():
+    """
+    Tabla de Synergy Logistics guardada en una base SQLite local, con indice en las columnas
+    de filtrado más comunes. Los filtros de filter_routes_df se traducen a una cláusula WHERE y
+    los conteos, sumas y agrupaciones se calculan dentro de SQLite (COUNT, SUM y GROUP BY), de
+    modo que solo se lee a memoria el resultado de cada consulta.
+
+    La base se genera a partir del CSV la primera vez y se reconstruye si el CSV cambia. Los
+    registros anexados con append() se guardan en una tabla temporal de la conexión: no
+    modifican la base en disco.
+    """
+    def __init__(self, data_file_path: str, database_path: str or None = None, rebuild: bool = False) -> None:
+        """Abre la base del CSV, generándola si no existe o ya no corresponde al CSV.
+
+        Args:
+            data_file_path (str): Ruta del archivo CSV.
+            database_path (str or None, optional): Ruta de la base. Defaults to None (junto al CSV).
+            rebuild (bool, optional): Si es True, se vuelve a generar la base aunque sea valida.
+                Defaults to False.
+        """
+        self.data_file_path = data_file_path
+        self.database_path = database_path or database_path_for(data_file_path)
+        if rebuild or not self._is_valid():
+            self._build()
+        # La conexión puede usarse desde otro hilo (p. ej. el hilo de consultas del servidor)
+        self.connection = sqlite3.connect(self.database_path, check_same_thread=False)
+        self.columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({ROUTES_TABLE})")
+                        if row[1] != "position"]
+        # Tabla o vista que se consulta (la vista se crea al anexar registros)
+        self.source = ROUTES_TABLE
+
+    def _is_valid(self) -> bool:
+        """Indica si la base existe y fue generada a partir del CSV actual con el esquema actual."""
+        if not os.path.exists(self.database_path):
+            return False
+        try:
+            connection = sqlite3.connect(self.database_path)
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+            finally:
+                connection.close()
+        except sqlite3.DatabaseError:
+            return False
+        key = source_key(self.data_file_path)
+        return meta == {"version": str(SQLITE_VERSION), "size": str(key["size"]), "mtime_ns": str(key["mtime_ns"])}
+
+    def _build(self) -> None:
+        """
+        Carga el CSV por bloques en una base nueva y crea los indices al final (es más rápido
+        que mantenerlos durante la carga). La base se escribe en un archivo temporal y se
+        reemplaza al terminar, para que una carga interrumpida no deje una base incompleta.
+        """
+        # Importación local para evitar una dependencia circular con sl_filters
+        from processing.sl_filters import read_synergy_chunks
+        tmp_path = f"{self.database_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        connection = sqlite3.connect(tmp_path)
+        try:
+            position = 0
+            for chunk in read_synergy_chunks(self.data_file_path, SQL_CHUNKSIZE):
+                chunk = chunk.reset_index()
+                columns = list(chunk.columns)
+                if position == 0:
+                    definitions = ", ".join(
+                        f'"{column}" {"INTEGER" if pd.api.types.is_integer_dtype(chunk[column]) else "TEXT"}'
+                        for column in columns)
+                    connection.execute(f"CREATE TABLE {ROUTES_TABLE} (position INTEGER PRIMARY KEY, {definitions})")
+                placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+                connection.executemany(f"INSERT INTO {ROUTES_TABLE} VALUES ({placeholders})",
+                                       sql_rows(chunk, columns, position))
+                position += len(chunk)
+            for column in SQL_INDEX_COLUMNS:
+                connection.execute(f'CREATE INDEX {ROUTES_TABLE}_{column} ON {ROUTES_TABLE} ("{column}")')
+            key = source_key(self.data_file_path)
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                                   [("version", str(SQLITE_VERSION)), ("size", str(key["size"])),
+                                    ("mtime_ns", str(key["mtime_ns"]))])
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.database_path)
+
+    def _where(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> Tuple[str, List]:
+        """Traduce filtros ya validados a una cláusula WHERE con parametros.
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            Tuple[str, List]: Cláusula (vacia si no hay filtros) y sus parametros.
+        """
+        conditions, params = [], []
+        for column, value in equality_filters.items():
+            conditions.append(f'"{column}" = ?')
+            params.append(sql_param(value))
+        for column, compare, bound in range_filters:
+            conditions.append(f'"{column}" {SQL_OPERATORS[compare]} ?')
+            params.append(sql_param(bound))
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
+
+    def _to_table(self, rows: DataFrame) -> DataFrame:
+        """Da a filas leidas de la base el formato de read_synergy_csv (indice y fechas)."""
+        rows = rows.set_index("register_id")
+        rows["date"] = pd.to_datetime(rows["date"], format=SQL_DATE_FORMAT)
+        return rows
+
+    def select(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> DataFrame:
+        """Filas que cumplen los filtros, en el orden del CSV.
+
+        Args:
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            DataFrame: Filas indexadas por register_id.
+        """
+        where, params = self._where(equality_filters, range_filters)
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        query = f"SELECT {columns} FROM {self.source}{where} ORDER BY position"
+        return self._to_table(pd.read_sql_query(query, self.connection, params=params))
+
+    def iter_chunks(self, chunksize: int or None = None) -> Iterator[DataFrame]:
+        """Recorre la tabla completa por bloques, en el orden del CSV.
+
+        Args:
+            chunksize (int or None, optional): Filas por bloque. Defaults to None (SQL_CHUNKSIZE).
+
+        Yields:
+            Iterator[DataFrame]: Bloques indexados por register_id.
+        """
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        query = f"SELECT {columns} FROM {self.source} ORDER BY position"
+        for chunk in pd.read_sql_query(query, self.connection, chunksize=chunksize or SQL_CHUNKSIZE):
+            yield self._to_table(chunk)
+
+    def measures(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> Tuple[int, int]:
+        """Número de transacciones y suma de valor de las filas que cumplen los filtros.
+
+        Returns:
+            Tuple[int, int]: Frecuencia y suma de valor.
+        """
+        where, params = self._where(equality_filters, range_filters)
+        query = f"SELECT COUNT(*), COALESCE(SUM(total_value), 0) FROM {self.source}{where}"
+        frecuency, total_value = self.connection.execute(query, params).fetchone()
+        return int(frecuency), int(total_value)
+
+    def aggregate(self, by: List[str], equality_filters: Dict[str, object], range_filters: List[Tuple]) -> DataFrame:
+        """
+        Número de transacciones y suma de valor por grupo. Los grupos quedan en el orden en que
+        aparecen en el CSV, igual que groupby(sort=False).
+
+        Args:
+            by (List[str]): Columnas de agrupación.
+            equality_filters (Dict[str, object]): Filtros de igualdad (columna -> valor).
+            range_filters (List[Tuple]): Filtros de rango (columna, comparación, limite).
+
+        Returns:
+            DataFrame: Columnas de agrupación, 'frecuency' y 'total_value'.
+        """
+        where, params = self._where(equality_filters, range_filters)
+        columns = ", ".join(f'"{column}"' for column in by)
+        query = (f"SELECT {columns}, COUNT(*) AS frecuency, SUM(total_value) AS total_value "
+                 f"FROM {self.source}{where} GROUP BY {columns} ORDER BY MIN(position)")
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def distinct(self, column: str) -> List:
+        """Valores distintos de una columna en orden de primera aparición.
+
+        Args:
+            column (str): Nombre de la columna.
+
+        Returns:
+            List: Valores distintos.
+        """
+        query = f'SELECT "{column}" FROM {self.source} GROUP BY "{column}" ORDER BY MIN(position)'
+        return [row[0] for row in self.connection.execute(query)]
+
+    def domains(self, columns: List[str]) -> Dict[str, Set]:
+        """Conjunto de valores distintos de cada columna (se resuelven con los indices).
+
+        Args:
+            columns (List[str]): Columnas.
+
+        Returns:
+            Dict[str, Set]: Columna -> valores.
+        """
+        return {column: {row[0] for row in self.connection.execute(f'SELECT DISTINCT "{column}" FROM {self.source}')}
+                for column in columns}
+
+    def min_value(self, column: str) -> object:
+        """Valor minimo de una columna."""
+        return self.connection.execute(f'SELECT MIN("{column}") FROM {self.source}').fetchone()[0]
+
+    def append(self, rows: DataFrame) -> None:
+        """
+        Anexa registros en una tabla temporal de la conexión. A partir de la primera llamada las
+        consultas se hacen sobre una vista que une la tabla de la base con la temporal.
+
+        Args:
+            rows (DataFrame): Registros indexados por register_id, con fechas como datetime.
+        """
+        if self.source == ROUTES_TABLE:
+            self.connection.execute(f"CREATE TEMP TABLE appended_routes AS SELECT * FROM {ROUTES_TABLE} WHERE 0")
+            columns = ", ".join(["position"] + [f'"{column}"' for column in self.columns])
+            self.connection.execute(f"CREATE TEMP VIEW {ROUTES_VIEW} AS SELECT {columns} FROM main.{ROUTES_TABLE} "
+                                    f"UNION ALL SELECT {columns} FROM appended_routes")
+            self.source = ROUTES_VIEW
+        first_position = self.connection.execute(f"SELECT COALESCE(MAX(position), -1) + 1 FROM {self.source}").fetchone()[0]
+        placeholders = ", ".join("?" for _ in range(len(self.columns) + 1))
+        columns = ", ".join(["position"] + [f'"{column}"' for column in self.columns])
+        with self.connection:
+            self.connection.executemany(f"INSERT INTO appended_routes ({columns}) VALUES ({placeholders})",
+                                        sql_rows(rows.reset_index(), self.columns, first_position))
@@ -0,0 +1,227 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+# Periodos de agrupación en el tiempo -> (código de periodo de pandas, periodos por año)
+TIME_FREQUENCIES = {"year": ("Y", 1), "quarter": ("Q", 4), "month": ("M", 12)}
+# Dimensiones por las que se pueden agrupar las series
+SERIES_DIMENSIONS = ["direction", "origin", "destination", "transport_mode", "product"]
+
+
+class SynergyLogisticsTimeSeries():
+    """
+    Series de tiempo de frecuencia y valor total. Las filas se agrupan una sola vez por periodo
+    (año, trimestre o mes) y dimensiones; para cada agrupación pedida se calculan sumas
+    acumuladas sobre los periodos, de modo que el total de cualquier rango de periodos, las
+    ventanas móviles y el crecimiento anual se obtienen restando sumas acumuladas, sin volver
+    a recorrer las filas.
+    """
+    def __init__(self, routes_table: DataFrame or None, freq: str = "year",
+                 dimensions: List[str] = SERIES_DIMENSIONS) -> None:
+        """Agrupa las filas por periodo y dimensiones.
+
+        Args:
+            routes_table (DataFrame or None): Tabla de Synergy Logistics (None = sin filas aún).
+            freq (str, optional): 'year', 'quarter' o 'month'. Defaults to "year".
+            dimensions (List[str], optional): Dimensiones de agrupación. Defaults to SERIES_DIMENSIONS.
+        """
+        if freq not in TIME_FREQUENCIES:
+            raise ValueError(f"Periodo '{freq}' no soportado. Opciones: {list(TIME_FREQUENCIES)}")
+        self.freq = freq
+        self.period_code, self.periods_per_year = TIME_FREQUENCIES[freq]
+        self.dimensions = list(dimensions)
+        self.cells = None
+        self._prefix_sums = {}
+        if routes_table is not None:
+            self.add_rows(routes_table)
+
+    def add_rows(self, rows: DataFrame) -> None:
+        """Suma a las series filas nuevas (por ejemplo, otro bloque del CSV o registros anexados).
+
+        Args:
+            rows (DataFrame): Filas con columna 'date' y las dimensiones de la serie.
+        """
+        buckets = rows["date"].dt.to_period(self.period_code).array.asi8
+        cells = (rows.assign(bucket=buckets)
+                 .groupby(["bucket"] + self.dimensions, sort=False, observed=True)["total_value"]
+                 .agg(frecuency="size", total_value="sum")
+                 .reset_index())
+        if self.cells is not None:
+            cells = (pd.concat([self.cells, cells], ignore_index=True)
+                     .groupby(["bucket"] + self.dimensions, sort=False, observed=True)[["frecuency", "total_value"]]
+                     .sum()
+                     .reset_index())
+        self.cells = cells
+        # Las sumas acumuladas calculadas dejan de ser validas
+        self._prefix_sums = {}
+
+    @property
+    def buckets(self) -> pd.PeriodIndex:
+        """Periodos consecutivos desde el primero hasta el último con registros (vacio si no hay filas)."""
+        if self.cells is None or len(self.cells) == 0:
+            return pd.PeriodIndex([], freq=self.period_code)
+        first, last = self.cells["bucket"].min(), self.cells["bucket"].max()
+        return pd.PeriodIndex.from_ordinals(np.arange(first, last + 1), freq=self.period_code)
+
+    def _prefix(self, by: List[str], filters: Dict[str, object] or None) -> Tuple[object, np.ndarray]:
+        """
+        Sumas acumuladas por periodo para cada llave de agrupación. Se calculan una vez por
+        combinación de agrupación y filtros.
+
+        Args:
+            by (List[str]): Dimensiones de agrupación (vacio = total).
+            filters (Dict[str, object] or None): Dimensión -> valor.
+
+        Returns:
+            Tuple[object, np.ndarray]: Llaves (Index, MultiIndex o None) y arreglo
+                (periodos + 1, llaves, 2) con frecuencia y valor acumulados; la fila 0 es cero.
+        """
+        cache_key = (tuple(by), tuple(sorted((filters or {}).items())))
+        if cache_key in self._prefix_sums:
+            return self._prefix_sums[cache_key]
+        buckets = self.buckets
+        n_buckets = len(buckets)
+        first_bucket = buckets[0].ordinal if n_buckets else 0
+        cells = self.cells
+        if cells is None:
+            cells = pd.DataFrame(columns=["bucket"] + self.dimensions + ["frecuency", "total_value"])
+        if filters:
+            mask = np.ones(len(cells), dtype=bool)
+            for dimension, value in filters.items():
+                mask &= (cells[dimension] == value).to_numpy()
+            cells = cells[mask]
+        if by:
+            key_codes = cells.groupby(by, sort=False, observed=True).ngroup().to_numpy()
+            key_table = cells[by].drop_duplicates()
+            keys = key_table[by[0]].to_numpy() if len(by) == 1 else pd.MultiIndex.from_frame(key_table)
+            n_keys = len(key_table)
+        else:
+            key_codes = np.zeros(len(cells), dtype=np.int64)
+            keys = None
+            n_keys = 1
+        # Matriz densa periodo x llave, acumulada sobre los periodos
+        bucket_sums = np.zeros((n_buckets + 1, n_keys, 2), dtype=np.int64)
+        bucket_offsets = cells["bucket"].to_numpy(dtype=np.int64) - first_bucket + 1
+        np.add.at(bucket_sums, (bucket_offsets, key_codes, 0), cells["frecuency"].to_numpy(dtype=np.int64))
+        np.add.at(bucket_sums, (bucket_offsets, key_codes, 1), cells["total_value"].to_numpy(dtype=np.int64))
+        prefix = np.cumsum(bucket_sums, axis=0)
+        self._prefix_sums[cache_key] = (keys, prefix)
+        return keys, prefix
+
+    def _bucket_position(self, period, default: int) -> int:
+        """
+        Posición (1 = primer periodo) de un periodo como 2019, '2019Q3' o '2019-07'. Los
+        periodos fuera de las series quedan antes de 1 o después del último.
+        """
+        if period is None:
+            return default
+        ordinal = pd.Period(str(period), freq=self.period_code).ordinal
+        return int(ordinal - self.buckets[0].ordinal + 1)
+
+    def _table(self, by: List[str], keys, measures: np.ndarray, buckets: pd.PeriodIndex or None = None,
+               names: List[str] = ["frecuency", "total_value"]) -> DataFrame:
+        """Tabla larga (periodo, dimensiones, medidas) a partir de un arreglo (periodos, llaves, 2)."""
+        n_buckets, n_keys = measures.shape[0], measures.shape[1]
+        table = {}
+        if buckets is not None:
+            table["period"] = np.repeat(buckets.astype(str), n_keys)
+        if by:
+            key_frame = keys.to_frame(index=False) if isinstance(keys, pd.MultiIndex) else pd.DataFrame({by[0]: keys})
+            for column in by:
+                table[column] = np.tile(key_frame[column].to_numpy(), n_buckets)
+        for position, name in enumerate(names):
+            table[name] = measures[:, :, position].reshape(-1)
+        return pd.DataFrame(table)
+
+    def series(self, by: List[str] or str or None = None, filters: Dict[str, object] or None = None) -> DataFrame:
+        """Frecuencia y valor de cada periodo (incluye periodos sin registros, en 0).
+
+        Args:
+            by (List[str] or str or None, optional): Dimensiones de agrupación. Defaults to None.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Columnas 'period', dimensiones, 'frecuency' y 'total_value'.
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        keys, prefix = self._prefix(by, filters)
+        return self._table(by, keys, np.diff(prefix, axis=0), self.buckets)
+
+    def range_total(self, start=None, end=None, by: List[str] or str or None = None,
+                    filters: Dict[str, object] or None = None) -> DataFrame:
+        """
+        Totales de un rango de periodos (inclusivo) como diferencia de dos sumas acumuladas.
+
+        Args:
+            start (optional): Primer periodo (p. ej. 2016, '2016Q2', '2016-03'). Defaults to None (inicio).
+            end (optional): Último periodo. Defaults to None (final).
+            by (List[str] or str or None, optional): Dimensiones de agrupación. Defaults to None.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Dimensiones, 'frecuency' y 'total_value' del rango (en 0 si el rango no
+                incluye periodos con registros).
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        keys, prefix = self._prefix(by, filters)
+        n_buckets = len(self.buckets)
+        if n_buckets == 0:
+            return self._table(by, keys, np.zeros((1,) + prefix.shape[1:], dtype=np.int64))
+        # Solo cuentan los periodos del rango que están dentro de las series
+        start_position = max(self._bucket_position(start, 1), 1)
+        end_position = min(self._bucket_position(end, n_buckets), n_buckets)
+        if start_position > end_position:
+            # Rango vacio: inicia después del último periodo, termina antes del primero o start > end
+            totals = np.zeros(prefix.shape[1:], dtype=np.int64)
+        else:
+            totals = prefix[end_position] - prefix[start_position - 1]
+        return self._table(by, keys, totals[np.newaxis])
+
+    def rolling(self, window: int, by: List[str] or str or None = None,
+                filters: Dict[str, object] or None = None) -> DataFrame:
+        """Totales de ventanas móviles de 'window' periodos (una fila por periodo final de ventana completa).
+
+        Args:
+            window (int): Número de periodos de la ventana (al menos 1).
+            by (List[str] or str or None, optional): Dimensiones de agrupación. Defaults to None.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+
+        Returns:
+            DataFrame: Columnas 'period' (periodo final), dimensiones, 'frecuency' y 'total_value'.
+        """
+        if window <= 0:
+            raise ValueError(f"La ventana debe ser de al menos un periodo (window={window}).")
+        by = [by] if isinstance(by, str) else list(by or [])
+        keys, prefix = self._prefix(by, filters)
+        window_sums = prefix[window:] - prefix[:-window]
+        return self._table(by, keys, window_sums, self.buckets[window - 1:])
+
+    def growth(self, by: List[str] or str or None = None, filters: Dict[str, object] or None = None,
+               periods: int or None = None) -> DataFrame:
+        """
+        Crecimiento (%) de cada periodo respecto al periodo equivalente anterior. Por defecto se
+        compara contra el mismo periodo del año anterior.
+
+        Args:
+            by (List[str] or str or None, optional): Dimensiones de agrupación. Defaults to None.
+            filters (Dict[str, object] or None, optional): Dimensión -> valor. Defaults to None.
+            periods (int or None, optional): Periodos de diferencia (al menos 1). Defaults to None
+                (un año).
+
+        Returns:
+            DataFrame: Columnas 'period', dimensiones, 'frecuency_growth' y 'total_value_growth'
+                (NaN si el periodo de comparación no tiene registros).
+        """
+        if periods is None:
+            periods = self.periods_per_year
+        elif periods <= 0:
+            raise ValueError(f"La diferencia debe ser de al menos un periodo (periods={periods}).")
+        by = [by] if isinstance(by, str) else list(by or [])
+        keys, prefix = self._prefix(by, filters)
+        bucket_sums = np.diff(prefix, axis=0).astype(float)
+        current, previous = bucket_sums[periods:], bucket_sums[:-periods]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where(previous != 0, np.round((current - previous) / previous * 100, 2), np.nan)
+        return self._table(by, keys, growth, self.buckets[periods:],
+                           names=["frecuency_growth", "total_value_growth"])
@@ -0,0 +1,264 @@
+"""
+Particiones del análisis de Synergy Logistics.
+
+Cada función genera los resultados de una partición (opción, dirección y año): imprime el
+resumen en consola y, si los datos cambiaron desde la ejecución anterior, guarda sus tablas y
+gráficas. Las tablas se guardan con un escritor de resultados (un archivo SQLite con todas las
+particiones o un CSV por tabla en la carpeta de la partición). Regresan la huella de los datos
+para registrarla en el manifiesto del reporte.
+"""
+from typing import List, Tuple
+
+import pandas as pd
+
+from services.synergy_services import Service, add_shares
+from utils.graph_utils import ChartBuffer, ChartRenderPool, Summary_Chart
+from utils.report_manifest import is_dirty, table_fingerprint
+from utils.result_store import CsvResultWriter, ResultBuffer, ResultStore
+
+
+def as_dict(table: pd.DataFrame, measure: str) -> dict:
+    """Diccionario llave -> medida de una tabla de participación (para graficar)."""
+    return dict(zip(table["key"], table[measure].tolist()))
+
+
+def rank_by_value(service: Service, table: pd.DataFrame) -> pd.DataFrame:
+    """Filas de una tabla de participación con valor distinto de 0, de mayor a menor valor."""
+    non_zero = table[table["total_value"] != 0]
+    return service.top_k(non_zero, len(non_zero), key="total_value")
+
+
+def period_str(value: str or int or None) -> str:
+    """Nombre de carpeta para una dirección o año (None se refiere a todos)."""
+    # Manejo de casos none (crear str)
+    if value is None:
+        return "All"
+    return str(value)
+
+
+def option_1_partition(service: Service, direction: str or None, year: int or None, routes: List[str],
+                       output_initial_path: str, previous_fingerprint: str or None = None,
+                       writer: CsvResultWriter or ResultStore or ResultBuffer or None = None,
+                       charts: bool = True,
+                       renderer: ChartRenderPool or ChartBuffer or None = None) -> Tuple[str, float, float]:
+    """
+    Opción 1 (rutas más demandadas) para una dirección y año. Se analiza el no. de apariciones
+    de cada ruta y el valor de esas apariciones, como no. entero y como porcentaje del total.
+
+    Args:
+        service (Service): Servicio para las consultas.
+        direction (str or None): Dirección (None = ambas).
+        year (int or None): Año (None = todos).
+        routes (List[str]): Rutas con formato origen-destino.
+        output_initial_path (str): Carpeta raiz de resultados.
+        previous_fingerprint (str or None, optional): Huella de la ejecución anterior. Defaults to None.
+        writer (CsvResultWriter or ResultStore or ResultBuffer or None, optional): Escritor de las
+            tablas de resultados. Defaults to None (un CSV por tabla en output_initial_path).
+        charts (bool, optional): Si es False, solo se guardan las tablas (sin gráficas ni
+            plotly). Defaults to True.
+        renderer (ChartRenderPool or ChartBuffer or None, optional): Cola para exportar las
+            imagenes en paralelo. Defaults to None (exportación inmediata).
+
+    Returns:
+        Tuple[str, float, float]: Huella de los datos y suma de porcentajes de frecuencia y de
+            valor del top ten (para el resumen multianual).
+    """
+    direction_str = period_str(direction)
+    year_str = period_str(year)
+    # Frecuencia, valor y sus porcentajes de todas las rutas del periodo (incluye rutas sin apariciones)
+    route_table = service.share_table(["origin", "destination"], direction=direction, year=year, keys=routes)
+    fingerprint = table_fingerprint(route_table)
+    # Top ten en frecuencia y en valor; cada fila conserva sus porcentajes
+    top_ten_frecuency = service.top_k(route_table, 10, key="frecuency")
+    top_ten_value = service.top_k(route_table, 10, key="total_value")
+    # Imprimir rutas con mejor valor y más uso
+    print(f"Opción 1 - Direccion: {direction_str}, Año: {year_str} ")
+    print("Rutas más utilizadas:")
+    i=1
+    for route, frecuency in zip(top_ten_frecuency["key"], top_ten_frecuency["frecuency"]):
+        print(f"{i}.- {route}: {frecuency}")
+        i+=1
+    print("Rutas mejor valoradas:")
+    i=1
+    for route, value in zip(top_ten_value["key"], top_ten_value["total_value"]):
+        print(f"{i}.- {route}: {value}")
+        i+=1
+    print("")
+    # Resumen del periodo
+    summary = (fingerprint, sum(top_ten_frecuency["frecuency_pct"].tolist()),
+               sum(top_ten_value["total_value_pct"].tolist()))
+    # Definir folder para almacenar resultados; si los datos no cambiaron no se regenera
+    output_folder_year = f"{output_initial_path}/opcion_1/{direction_str}/{year_str}"
+    if not is_dirty(fingerprint, previous_fingerprint, *([output_folder_year] if charts else [])):
+        return summary
+    # Almacenar resultados
+    writer = writer or CsvResultWriter(output_initial_path)
+    # Todas las rutas
+    writer.write("opcion_1", direction_str, year_str, "results",
+                 route_table.rename(columns={"key": "route"})[["route", "frecuency", "frecuency_pct", "total_value", "total_value_pct"]])
+    # Top 10 en frecuency
+    writer.write("opcion_1", direction_str, year_str, "top10_frec",
+                 top_ten_frecuency.rename(columns={"key": "route"})[["route", "frecuency", "frecuency_pct"]])
+    # Top 10 en valor
+    writer.write("opcion_1", direction_str, year_str, "top10_value",
+                 top_ten_value.rename(columns={"key": "route"})[["route", "total_value", "total_value_pct"]])
+    if not charts:
+        return summary
+    # Graficar resultados
+    plot = Summary_Chart(output_folder_year, renderer=renderer)
+    plot.h_bar_summary(as_dict(top_ten_frecuency, "frecuency"), "Rutas con mayor demanda", "No. de Apariciones",
+                       "Rutas", "ruta_frec")
+    plot.h_bar_summary(as_dict(top_ten_value, "total_value"), "Rutas con mayor valor", "Valor total", "Rutas",
+                       "ruta_valor", "green")
+    plot.h_bar_summary(as_dict(top_ten_frecuency, "frecuency_pct"), "Rutas con mayor demanda", "Apariciones (%)",
+                       "Rutas", "ruta_frec_pct", "purple")
+    plot.h_bar_summary(as_dict(top_ten_value, "total_value_pct"), "Rutas con mayor valor", "Valor total (%)", "Rutas",
+                       "ruta_valor_pct", "purple")
+    return summary
+
+
+def option_1_summary(direction: str or None, year_list: List[str], frecuency_pct_list: List[float],
+                     value_pct_list: List[float], output_initial_path: str,
+                     writer: CsvResultWriter or ResultStore or None = None) -> None:
+    """Guarda el resumen multianual de la opción 1 para una dirección.
+
+    Args:
+        direction (str or None): Dirección (None = ambas).
+        year_list (List[str]): Periodos analizados.
+        frecuency_pct_list (List[float]): Porcentaje de frecuencia del top ten por periodo.
+        value_pct_list (List[float]): Porcentaje de valor del top ten por periodo.
+        output_initial_path (str): Carpeta raiz de resultados.
+        writer (CsvResultWriter or ResultStore or None, optional): Escritor de las tablas de
+            resultados. Defaults to None (un CSV en output_initial_path).
+    """
+    writer = writer or CsvResultWriter(output_initial_path)
+    data = {'year': year_list, 'frecunecy_pct':frecuency_pct_list, 'total_value_pct':value_pct_list}
+    writer.write("opcion_1", period_str(direction), None, "summary", pd.DataFrame(data))
+
+
+def option_2_partition(service: Service, direction: str or None, year: int or None, transport_modes: List[str],
+                       output_initial_path: str, previous_fingerprint: str or None = None,
+                       writer: CsvResultWriter or ResultStore or ResultBuffer or None = None,
+                       charts: bool = True,
+                       renderer: ChartRenderPool or ChartBuffer or None = None) -> str:
+    """
+    Opción 2 (medios de transporte más importantes) para una dirección y año. Se analiza el
+    no. de apariciones de cada transporte y el valor de esas apariciones.
+
+    Args:
+        service (Service): Servicio para las consultas.
+        direction (str or None): Dirección (None = ambas).
+        year (int or None): Año (None = todos).
+        transport_modes (List[str]): Medios de transporte.
+        output_initial_path (str): Carpeta raiz de resultados.
+        previous_fingerprint (str or None, optional): Huella de la ejecución anterior. Defaults to None.
+        writer (CsvResultWriter or ResultStore or ResultBuffer or None, optional): Escritor de las
+            tablas de resultados. Defaults to None (un CSV por tabla en output_initial_path).
+        charts (bool, optional): Si es False, solo se guardan las tablas (sin gráficas ni
+            plotly). Defaults to True.
+        renderer (ChartRenderPool or ChartBuffer or None, optional): Cola para exportar las
+            imagenes en paralelo. Defaults to None (exportación inmediata).
+
+    Returns:
+        str: Huella de los datos de la partición.
+    """
+    direction_str = period_str(direction)
+    year_str = period_str(year)
+    # Frecuencia, valor y sus porcentajes de todos los medios de transporte del periodo
+    transport_table = service.share_table("transport_mode", direction=direction, year=year, keys=transport_modes)
+    fingerprint = table_fingerprint(transport_table)
+    # Imprimir rutas con mejor valor y más uso
+    print(f"\nOpción 2 - Direccion: {direction_str}, Año: {year_str} ")
+    print("Transportes más utilizadas:")
+    i=1
+    for transport, frecuency, value in transport_table[["key", "frecuency", "total_value"]].itertuples(index=False):
+        print(f"{i}.- {transport}. {frecuency}. Valor: {value}")
+        i+=1
+    print("")
+    # Definir folder para almacenar resultados; si los datos no cambiaron no se regenera
+    output_folder_year = f"{output_initial_path}/opcion_2/{direction_str}/{year_str}"
+    if not is_dirty(fingerprint, previous_fingerprint, *([output_folder_year] if charts else [])):
+        return fingerprint
+    # Almacenar resultados
+    writer = writer or CsvResultWriter(output_initial_path)
+    # Todos los medios de transporte
+    writer.write("opcion_2", direction_str, year_str, "results",
+                 transport_table.rename(columns={"key": "transport"})[["transport", "frecuency", "frecuency_pct", "total_value", "total_value_pct"]])
+    if not charts:
+        return fingerprint
+    # Graficar resultados
+    plot = Summary_Chart(output_folder_year, renderer=renderer)
+    plot.pie_summary(as_dict(transport_table, "frecuency"), "Transporte con mayor demanda", "transporte_frec")
+    plot.pie_summary(as_dict(transport_table, "total_value"), "Transporte con mayor valor", "transporte_valor")
+    return fingerprint
+
+
+def option_3_partition(service: Service, year: int or None, origin_countries: List[str],
+                       destination_countries: List[str], output_initial_path: str,
+                       previous_fingerprint: str or None = None,
+                       writer: CsvResultWriter or ResultStore or ResultBuffer or None = None,
+                       charts: bool = True,
+                       renderer: ChartRenderPool or ChartBuffer or None = None) -> str:
+    """
+    Opción 3 (paises que generan mayor valor) para un año. Para importaciones se considera el
+    pais de destino y para exportaciones el de origen.
+
+    Args:
+        service (Service): Servicio para las consultas.
+        year (int or None): Año (None = todos).
+        origin_countries (List[str]): Paises de origen.
+        destination_countries (List[str]): Paises de destino.
+        output_initial_path (str): Carpeta raiz de resultados.
+        previous_fingerprint (str or None, optional): Huella de la ejecución anterior. Defaults to None.
+        writer (CsvResultWriter or ResultStore or ResultBuffer or None, optional): Escritor de las
+            tablas de resultados. Defaults to None (un CSV por tabla en output_initial_path).
+        charts (bool, optional): Si es False, solo se guardan las tablas (sin gráficas ni
+            plotly). Defaults to True.
+        renderer (ChartRenderPool or ChartBuffer or None, optional): Cola para exportar las
+            imagenes en paralelo. Defaults to None (exportación inmediata).
+
+    Returns:
+        str: Huella de los datos de la partición.
+    """
+    year_str = period_str(year)
+    # Valor de cada pais de destino (Importaciones) y de origen (Exportaciones), con sus porcentajes
+    import_table = service.share_table("destination", direction="Imports", year=year, keys=destination_countries)
+    export_table = service.share_table("origin", direction="Exports", year=year, keys=origin_countries)
+    fingerprint = table_fingerprint(import_table, export_table)
+    # Definir folder para almacenar resultados; si los datos no cambiaron no se regenera
+    output_folder_year = f"{output_initial_path}/opcion_3/All/{year_str}"
+    output_import_folder_year = f"{output_initial_path}/opcion_3/Imports/{year_str}"
+    output_export_folder_year = f"{output_initial_path}/opcion_3/Exports/{year_str}"
+    chart_folders = [output_folder_year, output_import_folder_year, output_export_folder_year] if charts else []
+    if not is_dirty(fingerprint, previous_fingerprint, *chart_folders):
+        return fingerprint
+    # Sumar importaciones y exportaciones de cada pais para tener total
+    total_table = add_shares(pd.concat([export_table, import_table])
+                             .groupby("key", sort=False)[["total_value"]].sum()
+                             .reset_index())
+    # Ordenar paises de mayor a menor valor, omitiendo los que no tienen valor
+    country_import = rank_by_value(service, import_table)
+    country_export = rank_by_value(service, export_table)
+    country_total = rank_by_value(service, total_table)
+    # Almacenar resultados
+    writer = writer or CsvResultWriter(output_initial_path)
+    columns = {"key": "country"}
+    writer.write("opcion_3", "Imports", year_str, "results",
+                 country_import.rename(columns=columns)[["country", "total_value", "total_value_pct"]])
+    writer.write("opcion_3", "Exports", year_str, "results",
+                 country_export.rename(columns=columns)[["country", "total_value", "total_value_pct"]])
+    writer.write("opcion_3", "All", year_str, "results",
+                 country_total.rename(columns=columns)[["country", "total_value", "total_value_pct"]])
+    if not charts:
+        return fingerprint
+    # Graficar resultados
+    import_plot = Summary_Chart(output_import_folder_year, renderer=renderer)
+    import_plot.h_bar_summary(as_dict(country_import, "total_value"), "Paises con mayor valor", "Valor total (%)",
+                              "Pais", "pais_valor")
+    export_plot = Summary_Chart(output_export_folder_year, renderer=renderer)
+    export_plot.h_bar_summary(as_dict(country_export, "total_value"), "Paises con mayor valor", "Valor total (%)",
+                              "Pais", "pais_valor")
+    plot = Summary_Chart(output_folder_year, renderer=renderer)
+    plot.h_bar_summary(as_dict(country_total, "total_value"), "Paises con mayor valor", "Valor total (%)",
+                       "Pais", "pais_valor")
+    return fingerprint
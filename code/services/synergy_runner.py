@@ -0,0 +1,165 @@
+import io
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Tuple
+
+from services.synergy_services import Service
+from utils import instrumentation
+from utils.graph_utils import ChartBuffer, ChartRenderPool
+from utils.result_store import CsvResultWriter, ResultBuffer, ResultStore
+
+# Servicio de cada proceso del pool (se crea una sola vez en el inicializador)
+_worker_service = None
+
+
+def _init_worker(service_options: Dict[str, object], delta_path: str or None, profile: bool) -> None:
+    """
+    Crea el servicio del proceso. La tabla compacta se carga desde la caché binaria del CSV y
+    sus columnas son los mismos arreglos abiertos como memoria mapeada (sin copiarlos): todos
+    los procesos comparten las paginas del archivo en lugar de recibir una copia serializada
+    de la tabla. Con registros anexados (delta_path) la tabla se vuelve a formar y cada
+    proceso tiene su propia copia.
+
+    Args:
+        service_options (Dict[str, object]): Argumentos para construir el servicio.
+        delta_path (str or None): CSV con registros anexados en el proceso principal.
+        profile (bool): Si es True, se activa la instrumentación en el proceso.
+    """
+    global _worker_service
+    # Con fork el proceso hereda lo registrado en el proceso principal, que ya se cuenta ahí
+    instrumentation.reset()
+    if profile:
+        instrumentation.enable()
+    _worker_service = Service(**service_options)
+    if delta_path is not None:
+        _worker_service.ingest_delta(delta_path)
+
+
+def _run_partition(partition_function: Callable, args: Tuple, kwargs: Dict[str, object],
+                   capture_tables: bool, capture_images: bool) -> Tuple[str, object, Dict, List, List]:
+    """
+    Ejecuta una partición en el proceso y captura lo que imprime en consola. Si la
+    instrumentación está activa, también regresa los tiempos registrados por la partición.
+
+    Args:
+        partition_function (Callable): Función de la partición (recibe el servicio primero).
+        args (Tuple): Argumentos restantes de la función.
+        kwargs (Dict[str, object]): Argumentos por nombre de la función.
+        capture_tables (bool): Si es True, las tablas de resultados de la partición se
+            acumulan en memoria y se regresan para que las escriba el proceso principal.
+        capture_images (bool): Si es True, las gráficas de la partición se regresan serializadas
+            para que las exporte el pool de imagenes del proceso principal.
+
+    Returns:
+        Tuple[str, object, Dict, List, List]: Texto impreso, resultado de la función, tiempos
+            registrados, tablas de resultados y gráficas por exportar.
+    """
+    output = io.StringIO()
+    buffer = ResultBuffer()
+    chart_buffer = ChartBuffer()
+    if capture_tables:
+        kwargs = {**kwargs, "writer": buffer}
+    if capture_images:
+        kwargs = {**kwargs, "renderer": chart_buffer}
+    with redirect_stdout(output):
+        result = partition_function(_worker_service, *args, **kwargs)
+    stats = instrumentation.snapshot()
+    instrumentation.reset()
+    return output.getvalue(), result, stats, buffer.tables, chart_buffer.images
+
+
+class PartitionRunner:
+    """
+    Ejecuta las particiones del análisis (opción, dirección y año) en un pool de procesos.
+    Las particiones se envían todas al inicio y sus resultados se recogen en el orden de
+    envío; lo que imprime cada partición se muestra al recoger su resultado, de modo que la
+    salida en consola es la misma que en una ejecución secuencial. Si se indica un escritor de
+    resultados, las tablas de cada partición se escriben desde el proceso principal (un solo
+    escritor por archivo de resultados); si se indica un pool de imagenes, las gráficas de cada
+    partición se exportan en ese pool.
+    """
+    def __init__(self, service: Service, workers: int or None = None,
+                 service_options: Dict[str, object] or None = None, delta_path: str or None = None,
+                 writer: CsvResultWriter or ResultStore or None = None,
+                 renderer: ChartRenderPool or None = None) -> None:
+        """Crea el pool de procesos (o ninguno si se usa un solo proceso).
+
+        Args:
+            service (Service): Servicio del proceso principal (se usa si workers es 1).
+            workers (int or None, optional): Número de procesos. Defaults to None (uno por CPU).
+            service_options (Dict[str, object] or None, optional): Argumentos para construir el
+                servicio en cada proceso. Defaults to None.
+            delta_path (str or None, optional): CSV con registros anexados al servicio del
+                proceso principal. Defaults to None.
+            writer (CsvResultWriter or ResultStore or None, optional): Escritor de las tablas de
+                resultados. Defaults to None (cada partición usa su escritor por defecto).
+            renderer (ChartRenderPool or None, optional): Pool para exportar las imagenes de las
+                gráficas. Defaults to None (cada partición las exporta al generarlas).
+        """
+        self.service = service
+        self.writer = writer
+        self.renderer = renderer
+        self.workers = workers or os.cpu_count()
+        self._tasks: List[Future or Tuple[Callable, Tuple, Dict]] = []
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(service_options or {}, delta_path,
+                                                           instrumentation.is_enabled()))
+
+    def submit(self, partition_function: Callable, *args, **kwargs) -> int:
+        """Agrega una partición a la cola.
+
+        Args:
+            partition_function (Callable): Función de la partición (recibe el servicio primero).
+            *args: Argumentos restantes de la función.
+            **kwargs: Argumentos por nombre de la función.
+
+        Returns:
+            int: Identificador para recoger el resultado con result().
+        """
+        if self._executor is not None:
+            self._tasks.append(self._executor.submit(_run_partition, partition_function, args, kwargs,
+                                                    self.writer is not None, self.renderer is not None))
+        else:
+            # Sin pool la partición se ejecuta al recoger su resultado, en el mismo orden
+            self._tasks.append((partition_function, args, kwargs))
+        return len(self._tasks) - 1
+
+    def result(self, task_id: int) -> object:
+        """Espera el resultado de una partición e imprime su salida en consola.
+
+        Args:
+            task_id (int): Identificador regresado por submit().
+
+        Returns:
+            object: Resultado de la función de la partición.
+        """
+        task = self._tasks[task_id]
+        if isinstance(task, Future):
+            output, result, stats, tables, images = task.result()
+            print(output, end="")
+            instrumentation.merge(stats)
+            for table in tables:
+                self.writer.write(*table)
+            for image in images:
+                self.renderer.submit_json(*image)
+            return result
+        partition_function, args, kwargs = task
+        if self.writer is not None:
+            kwargs = {**kwargs, "writer": self.writer}
+        if self.renderer is not None:
+            kwargs = {**kwargs, "renderer": self.renderer}
+        return partition_function(self.service, *args, **kwargs)
+
+    def close(self) -> None:
+        """Termina los procesos del pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "PartitionRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,354 @@
+"""
+Servidor local de consultas de Synergy Logistics (HTTP/JSON sobre asyncio).
+
+La tabla se carga una sola vez y se mantiene en memoria mientras el servidor está activo. Las
+consultas se ejecutan en un pool de procesos (cada proceso abre la caché binaria del CSV como
+memoria mapeada), de modo que el ciclo de eventos solo recibe peticiones y envía respuestas.
+
+Endpoints (GET, parametros en la URL):
+    /health                                   Estado del servidor.
+    /measures?<filtros>                       Frecuencia y valor total.
+    /aggregate?by=origin,destination&<filtros>  Frecuencia y valor por grupo.
+    /top?by=<columnas>&k=10&key=total_value&<filtros>  Los k grupos con mayor medida.
+    /routes?direction=Exports                 Rutas origen-destino.
+    /unique?column=transport_mode             Valores distintos de una columna.
+
+Filtros: direction, origin, destination, year, product, transport_mode, company_name,
+start_year, end_year, start_date, end_date (DD/MM/YYYY), min_value, max_value.
+
+Uso (desde la carpeta code):
+    python -m services.synergy_server --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+from pandas.core.frame import DataFrame
+
+from processing.sl_filters import CATEGORY_COLUMNS, DATA_FILE_PATH
+from processing.sl_query import SynergyLogisticsQuery
+from services.synergy_services import Service
+
+# Parametros de filtro de igualdad y de rango (mismos nombres que filter_routes_df)
+EQUALITY_PARAMS = ["direction", "origin", "destination", "year", "product", "transport_mode", "company_name"]
+RANGE_PARAMS = ["start_year", "end_year", "start_date", "end_date", "min_value", "max_value"]
+# Parametros numericos
+INT_PARAMS = ["year", "start_year", "end_year", "min_value", "max_value", "k"]
+# Parametros de los endpoints (además de los filtros)
+OPTION_PARAMS = ["by", "k", "key", "column"]
+# Formato de start_date y end_date (el mismo que en filter_routes_df)
+DATE_FORMAT = "%d/%m/%Y"
+# Columnas por las que se puede agrupar
+GROUP_COLUMNS = CATEGORY_COLUMNS + ["year"]
+# Medidas por las que se puede ordenar el top-k
+MEASURES = ["frecuency", "total_value"]
+# Endpoints que se resuelven en el pool
+QUERY_ENDPOINTS = ["/measures", "/aggregate", "/top", "/routes", "/unique"]
+# Cuerpo máximo que se descarta de una petición (solo se admite GET, que no lleva cuerpo)
+MAX_BODY_BYTES = 64 * 2**10
+# Frases de estado HTTP usadas en las respuestas
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+# Servicio de cada proceso del pool (se crea una sola vez en el inicializador)
+_worker_service = None
+
+
+def _init_worker(service_options: Dict[str, object]) -> None:
+    """Crea el servicio del proceso.
+
+    Args:
+        service_options (Dict[str, object]): Argumentos para construir el servicio.
+    """
+    global _worker_service
+    _worker_service = Service(**service_options)
+
+
+def parse_params(query_string: str) -> Dict[str, object]:
+    """Parametros de la URL, con los numericos convertidos a int.
+
+    Args:
+        query_string (str): Parte de la URL después de '?'.
+
+    Returns:
+        Dict[str, object]: Parametro -> valor.
+    """
+    params = dict(parse_qsl(query_string))
+    for param in INT_PARAMS:
+        if param in params:
+            try:
+                params[param] = int(params[param])
+            except ValueError:
+                raise ValueError(f"El parametro '{param}' debe ser un entero.") from None
+    return params
+
+
+def validate_params(service: Service, params: Dict[str, object]) -> None:
+    """
+    Revisa los parametros de una consulta. A diferencia de filter_routes_df, que ignora los
+    filtros invalidos, el servidor los rechaza (ValueError, respuesta 400) para no responder
+    con los totales de otra consulta.
+
+    Args:
+        service (Service): Servicio con los valores validos de cada columna.
+        params (Dict[str, object]): Parametros de la URL.
+    """
+    unknown_params = [param for param in params if param not in EQUALITY_PARAMS + RANGE_PARAMS + OPTION_PARAMS]
+    if unknown_params:
+        raise ValueError(f"Parametros desconocidos: {unknown_params}")
+    # Valores validos de cada columna (los mismos de get_unique_values) y años validos
+    domains = service.domains
+    for param in EQUALITY_PARAMS:
+        if param in params and params[param] not in domains[param]:
+            raise ValueError(f"El valor '{params[param]}' no es valido para el parametro '{param}'.")
+    for param in ["start_year", "end_year"]:
+        if param in params and params[param] not in domains["year"]:
+            raise ValueError(f"El valor '{params[param]}' no es un año valido para el parametro '{param}'.")
+    for param in ["start_date", "end_date"]:
+        if param in params:
+            try:
+                datetime.strptime(params[param], DATE_FORMAT)
+            except ValueError:
+                raise ValueError(f"El parametro '{param}' debe tener el formato DD/MM/YYYY.") from None
+    if "k" in params and params["k"] <= 0:
+        raise ValueError("El parametro 'k' debe ser un entero positivo.")
+
+
+def group_columns(params: Dict[str, object]) -> list:
+    """Columnas de agrupación del parametro 'by' (separadas por coma)."""
+    if "by" not in params:
+        raise ValueError("Falta el parametro 'by'.")
+    by = params["by"].split(",")
+    invalid_columns = [column for column in by if column not in GROUP_COLUMNS]
+    if invalid_columns:
+        raise ValueError(f"No se puede agrupar por {invalid_columns}. Opciones: {GROUP_COLUMNS}")
+    return by
+
+
+def records(table: DataFrame) -> list:
+    """Filas de una tabla como lista de diccionarios."""
+    return table.astype({column: str for column in table.columns if table[column].dtype == "category"}) \
+        .to_dict(orient="records")
+
+
+def run_query(service: Service, path: str, params: Dict[str, object]) -> object:
+    """
+    Resuelve la consulta de un endpoint. Los parametros invalidos se rechazan (ver validate_params).
+
+    Args:
+        service (Service): Servicio para las consultas.
+        path (str): Endpoint (p. ej. '/measures').
+        params (Dict[str, object]): Parametros de la URL.
+
+    Returns:
+        object: Resultado serializable como JSON.
+    """
+    validate_params(service, params)
+    query = SynergyLogisticsQuery(service, {param: params[param] for param in EQUALITY_PARAMS if param in params},
+                                  {param: params[param] for param in RANGE_PARAMS if param in params})
+    if path == "/measures":
+        return query.agg()
+    if path == "/aggregate":
+        return records(query.agg(by=group_columns(params)))
+    if path == "/top":
+        key = params.get("key", "total_value")
+        if key not in MEASURES:
+            raise ValueError(f"El parametro 'key' debe ser uno de {MEASURES}.")
+        table = query.agg(by=group_columns(params))
+        return records(service.top_k(table, params.get("k", 10), key=key))
+    if path == "/routes":
+        return service.get_routes_list(params.get("direction"))
+    if path == "/unique":
+        if params.get("column") not in GROUP_COLUMNS:
+            raise ValueError(f"El parametro 'column' debe ser uno de {GROUP_COLUMNS}.")
+        return service.get_unique_values(params["column"])
+    raise ValueError(f"Endpoint '{path}' no existe.")
+
+
+def _run_worker_query(path: str, params: Dict[str, object]) -> object:
+    """Resuelve una consulta con el servicio del proceso del pool."""
+    return run_query(_worker_service, path, params)
+
+
+def json_default(value: object) -> object:
+    """Convierte a tipos de JSON los escalares de NumPy."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class SynergyServer:
+    """
+    Servidor HTTP/JSON de consultas. Atiende varias conexiones a la vez (HTTP/1.1 con
+    conexiones persistentes) y ejecuta cada consulta en el pool para no bloquear el ciclo de
+    eventos.
+    """
+    def __init__(self, service: Service, workers: int = 0, service_options: Dict[str, object] or None = None) -> None:
+        """Crea el pool de consultas.
+
+        Args:
+            service (Service): Servicio del proceso principal (se usa si workers es 0).
+            workers (int, optional): Procesos para las consultas (0 = un hilo del proceso
+                principal). Defaults to 0.
+            service_options (Dict[str, object] or None, optional): Argumentos para construir el
+                servicio en cada proceso. Defaults to None.
+        """
+        self.service = service
+        self.workers = workers
+        self.executor: Executor
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(service_options or {},))
+        else:
+            # Un solo hilo: el servicio (y su caché de consultas) no se comparte entre hilos
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def respond(self, method: str, target: str) -> Tuple[int, object]:
+        """Resuelve una petición.
+
+        Args:
+            method (str): Método HTTP.
+            target (str): Ruta con parametros.
+
+        Returns:
+            Tuple[int, object]: Estado HTTP y cuerpo de la respuesta.
+        """
+        if method != "GET":
+            return 405, {"error": "Solo se admite GET."}
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, {"status": "ok", "workers": self.workers}
+        if url.path not in QUERY_ENDPOINTS:
+            return 404, {"error": f"Endpoint '{url.path}' no existe."}
+        try:
+            params = parse_params(url.query)
+            loop = asyncio.get_running_loop()
+            if self.workers > 0:
+                result = await loop.run_in_executor(self.executor, _run_worker_query, url.path, params)
+            else:
+                result = await loop.run_in_executor(self.executor, run_query, self.service, url.path, params)
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        return 200, result
+
+    async def handle_request(self, reader: asyncio.StreamReader, request_line: bytes,
+                             headers: Dict[str, str]) -> Tuple[int, object, bool]:
+        """
+        Resuelve una petición ya leida (linea de petición y encabezados) y descarta su cuerpo.
+        Si el cuerpo no tiene un largo valido o supera MAX_BODY_BYTES no se lee, y la conexión
+        se cierra después de responder.
+
+        Returns:
+            Tuple[int, object, bool]: Estado HTTP, cuerpo de la respuesta y si la conexión sigue abierta.
+        """
+        try:
+            content_length = int(headers.get("content-length", 0))
+            if content_length < 0:
+                raise ValueError
+        except ValueError:
+            # Sin un largo valido no se sabe dónde termina la petición: se cierra la conexión
+            return 400, {"error": "Encabezado Content-Length invalido."}, False
+        if content_length > MAX_BODY_BYTES:
+            return 413, {"error": f"El cuerpo de la petición supera {MAX_BODY_BYTES} bytes."}, False
+        # Descartar el cuerpo, si lo hay (solo se admite GET)
+        if content_length:
+            await reader.readexactly(content_length)
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            status, body, version = 400, {"error": "Petición invalida."}, "HTTP/1.1"
+        else:
+            status, body = await self.respond(method, target)
+        return status, body, headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende las peticiones de una conexión hasta que el cliente la cierra."""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    headers = {}
+                    while True:
+                        header_line = await reader.readline()
+                        if header_line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = header_line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    # Linea más larga que el limite del StreamReader: el resto de la conexión no se puede leer
+                    status, body, keep_alive = 400, {"error": "Linea de petición o encabezado demasiado larga."}, False
+                else:
+                    status, body, keep_alive = await self.handle_request(reader, request_line, headers)
+                payload = json.dumps(body, default=json_default).encode()
+                writer.write(f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Atiende peticiones hasta que se interrumpe el proceso.
+
+        Args:
+            host (str, optional): Dirección. Defaults to "127.0.0.1".
+            port (int, optional): Puerto. Defaults to 8765.
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Servidor de consultas en http://{host}:{port} ({self.workers} procesos)", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """Termina el pool de consultas."""
+        self.executor.shutdown()
+
+
+def _interrupt(signum: int, frame: object) -> None:
+    """Atiende SIGTERM como Ctrl+C, para que main() termine el pool antes de salir."""
+    raise KeyboardInterrupt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de consultas de Synergy Logistics.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del servidor.")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto del servidor.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Procesos para las consultas (0 = un hilo del proceso principal).")
+    parser.add_argument("--data", default=DATA_FILE_PATH, help="CSV de Synergy Logistics.")
+    parser.add_argument("--backend", choices=["pandas", "sqlite"], default="pandas",
+                        help="Almacenamiento de la tabla: en memoria (pandas) o base SQLite local.")
+    args = parser.parse_args()
+
+    service_options = {"compact": True, "data_file_path": args.data, "backend": args.backend}
+    # La carga en el proceso principal genera la caché (o la base) que abren los procesos del pool
+    service = Service(**service_options)
+    server = SynergyServer(service, args.workers, service_options)
+    # Sin esto, SIGTERM (p. ej. de la prueba de carga) deja los procesos del pool huérfanos
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,237 @@
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+from processing.sl_cube import CUBE_DIMENSIONS, add_shares
 from processing.sl_filters import SynergyLogisticsFilters
+from utils.instrumentation import instrumented
+from utils.query_cache import QueryCache
+from utils.ranking_utils import top_items, top_positions
+
+# Memoria máxima de la caché de consultas (256 MB)
+CACHE_BYTES = 256 * 2**20
+
+
+def query_key(equality_filters: Dict[str, object], range_filters: List[Tuple] = ()) -> Tuple:
+    """Llave normalizada de una consulta: no depende del orden en que se dieron los filtros.
+
+    Args:
+        equality_filters (Dict[str, object]): Filtros de igualdad validos (columna -> valor).
+        range_filters (List[Tuple], optional): Filtros de rango (columna, comparación, limite).
+            Defaults to ().
+
+    Returns:
+        Tuple: Llave para la caché de consultas.
+    """
+    return (tuple(sorted(equality_filters.items())),
+            tuple(sorted((column, compare.__name__, bound) for column, compare, bound in range_filters)))
+
 
 class Service(SynergyLogisticsFilters):
     """
     Clase que contine servicios para el analisis de la tabla de Synergy Logistics.
     """
-    def get_routes_list(self,  direction:str or None = None) -> List:
+    def __init__(self, *args, cache_size: int = 128, cache_bytes: int or None = CACHE_BYTES, **kwargs) -> None:
+        """Crea la caché de consultas y carga la tabla (ver SynergyLogisticsFilters).
+
+        Args:
+            cache_size (int, optional): Número máximo de resultados de consultas guardados
+                (0 desactiva la caché). Defaults to 128.
+            cache_bytes (int or None, optional): Memoria máxima de los resultados guardados
+                (los cortes de filas son los más grandes). Defaults to CACHE_BYTES.
+        """
+        self.query_cache = QueryCache(cache_size, cache_bytes)
+        super().__init__(*args, **kwargs)
+
+    @SynergyLogisticsFilters.SYNERGY_DB.setter
+    def SYNERGY_DB(self, synergy_db: DataFrame) -> None:
+        # Los resultados guardados corresponden a la tabla anterior
+        SynergyLogisticsFilters.SYNERGY_DB.fset(self, synergy_db)
+        self.query_cache.clear()
+
+    def append(self, rows: DataFrame) -> List[Tuple]:
+        changed_partitions = super().append(rows)
+        if changed_partitions:
+            self.query_cache.clear()
+        return changed_partitions
+
+    def refresh_domains(self) -> None:
+        # Se llama cuando SYNERGY_DB se modificó sin reasignarse: los resultados guardados ya no valen
+        super().refresh_domains()
+        self.query_cache.clear()
+
+    def _apply_filters(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> DataFrame:
+        if not equality_filters and not range_filters and not self.streaming:
+            # Sin filtros la tabla en memoria se regresa tal cual (no hay corte que guardar)
+            return super()._apply_filters(equality_filters, range_filters)
+        # Cortes de filter_routes_df guardados por filtros normalizados. Se regresa una copia,
+        # para que modificar el resultado no altere la caché
+        filtered_table = self.query_cache.get(("rows",) + query_key(equality_filters, range_filters),
+                                              lambda: super(Service, self)._apply_filters(equality_filters, range_filters))
+        return filtered_table.copy()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Aciertos, fallos y tamaño de la caché de consultas.
+
+        Returns:
+            Dict[str, int]: Estadisticas de la caché.
+        """
+        return self.query_cache.info()
+
+    def get_routes_list(self,  direction:str or None = None, as_tuples: bool = False) -> List:
         """Genera una lista con todas las rutas diferentes de la tabla.
         
         Args:
             direction (str or None, optional): Dirección de transacción. Defaults to None.
+            as_tuples (bool, optional): Si es True, cada ruta se regresa como tupla
+                (origen, destino). Defaults to False.
 
         Returns:
-            List: Lista con rutas con formato origen-destino.
+            List: Lista con rutas con formato origen-destino, en el orden en que aparecen.
         """
-        routes_list = []
-        # Filter tables by direction
-        filtered_table = self.filter_routes_df(direction=direction)
-        # Check row by row table
-        for index, row in filtered_table.iterrows():
+        # Pares distintos (origen, destino) filtrados por dirección, conservando el orden de
+        # primera aparición. Se obtienen de las celdas del cubo, que también existen en modo por bloques
+        route_pairs = self.aggregate(["origin", "destination"], direction=direction)
+        routes_list = list(zip(route_pairs["origin"].astype(str), route_pairs["destination"].astype(str)))
+        if not as_tuples:
             # route=origin-destination
-            route = (row['origin']+ "-" + row['destination'])
-            if not route in routes_list:
-                routes_list.append(route)
+            routes_list = [f"{origin}-{destination}" for origin, destination in routes_list]
         return routes_list
-    
+
+    def split_route(self, route: str or Tuple[str, str]) -> Tuple[str, str]:
+        """
+        Separa una ruta en origen y destino. En rutas con formato origen-destino se busca el
+        guion que separa un origen y un destino existentes, ya que los nombres de los paises
+        también pueden contener guiones.
+
+        Args:
+            route (str or Tuple[str, str]): Ruta con formato origen-destino o tupla (origen, destino).
+
+        Returns:
+            Tuple[str, str]: Origen y destino.
+        """
+        if isinstance(route, tuple):
+            return route
+        origin_countries = self.domains["origin"]
+        destination_countries = self.domains["destination"]
+        parts = route.split("-")
+        for split_at in range(1, len(parts)):
+            origin, destination = "-".join(parts[:split_at]), "-".join(parts[split_at:])
+            if origin in origin_countries and destination in destination_countries:
+                return origin, destination
+        # Sin coincidencias se usa el primer guion (los filtros invalidos se reportan después)
+        origin, _, destination = route.partition("-")
+        return origin, destination
+
+    @instrumented()
+    def aggregate(self, by: List[str] or str, direction: str or None = None, year: int or None = None,
+                  transport_mode: str or None = None) -> DataFrame:
+        """
+        Agrupa la tabla filtrada por las columnas indicadas y calcula, en un solo recorrido,
+        el número de transacciones y la suma del valor total de cada grupo.
+        Se pueden filtrar resultados por dirección, año y/o medio de transporte.
+
+        Args:
+            by (List[str] or str): Columna o columnas para agrupar (p. ej. ["origin", "destination"]).
+            direction (str or None, optional): Dirección de transacción. Defaults to None.
+            year (int or None, optional): Año de transacciones. Defaults to None.
+            transport_mode (str or None, optional): Tipo de medio de transporte. Defaults to None.
+
+        Returns:
+            DataFrame: Tabla con las columnas de agrupación, 'frecuency' y 'total_value'.
+                Los grupos aparecen en el orden en que se encuentran en la tabla.
+        """
+        if isinstance(by, str):
+            by = [by]
+        equality_filters = self._valid_equality_filters(direction=direction, year=year,
+                                                        transport_mode=transport_mode)
+        aggregated_table = self.query_cache.get(("aggregate", tuple(by)) + query_key(equality_filters),
+                                                lambda: self._aggregate(by, equality_filters))
+        # Copia, para que modificar el resultado no altere la caché
+        return aggregated_table.copy()
+
+    def share_table(self, by: List[str] or str, direction: str or None = None, year: int or None = None,
+                    transport_mode: str or None = None, keys: List[str] or None = None) -> DataFrame:
+        """
+        Tabla de participación: para cada llave (p. ej. ruta origen-destino) el número de
+        transacciones, el valor total y ambos como porcentaje del total del periodo.
+        Las medidas y sus porcentajes quedan en la misma fila, de modo que ordenar la tabla
+        ordena todas juntas. Si se indican las llaves de paises o rutas, las medidas se leen de
+        la matriz de rutas (sumas de filas o columnas, o una lectura por ruta).
+
+        Args:
+            by (List[str] or str): Columna o columnas de la llave; con varias columnas los
+                valores se unen con guion (origen-destino).
+            direction (str or None, optional): Dirección de transacción. Defaults to None.
+            year (int or None, optional): Año de transacciones. Defaults to None.
+            transport_mode (str or None, optional): Tipo de medio de transporte. Defaults to None.
+            keys (List[str] or None, optional): Llaves a incluir, en ese orden (las que no
+                aparecen en el periodo quedan en 0). Defaults to None (llaves del periodo).
+
+        Returns:
+            DataFrame: Columnas 'key', 'frecuency', 'total_value', 'frecuency_pct' y 'total_value_pct'.
+        """
+        if isinstance(by, str):
+            by = [by]
+        if keys is not None and transport_mode is None and by in (["origin"], ["destination"], ["origin", "destination"]):
+            equality_filters = self._valid_equality_filters(direction=direction, year=year)
+            matrix_keys = [self.split_route(key) for key in keys] if len(by) == 2 else keys
+            table = self.route_matrix.table(by, matrix_keys, equality_filters.get("direction"),
+                                            equality_filters.get("year"))
+            table.insert(0, "key", list(keys))
+            return add_shares(table)
+        aggregated_table = self.aggregate(by, direction=direction, year=year, transport_mode=transport_mode)
+        key = aggregated_table[by[0]].astype(str)
+        for column in by[1:]:
+            key = key + "-" + aggregated_table[column].astype(str)
+        table = aggregated_table[["frecuency", "total_value"]].set_axis(pd.Index(key, name="key"))
+        if keys is not None:
+            table = table.reindex(pd.Index(keys, name="key"), fill_value=0)
+        return add_shares(table.reset_index())
+
+    @instrumented(rows=lambda result, self, by, equality_filters: len(self.cube.cells) if set(by) <= set(CUBE_DIMENSIONS) else self.n_rows)
+    def _aggregate(self, by: List[str], equality_filters: Dict[str, object]) -> DataFrame:
+        """Calcula aggregate() con filtros ya validados.
+
+        Args:
+            by (List[str]): Columnas de agrupación.
+            equality_filters (Dict[str, object]): Filtros de igualdad validos (columna -> valor).
+
+        Returns:
+            DataFrame: Columnas de agrupación, 'frecuency' y 'total_value'.
+        """
+        # Si las columnas son dimensiones del cubo, se agregan sus celdas en lugar de las filas
+        if set(by) <= set(CUBE_DIMENSIONS):
+            return self.cube.rollup(by, equality_filters)
+        if self.database is not None:
+            return self.database.aggregate(by, equality_filters, [])
+        if self.streaming:
+            # Agregar cada bloque del CSV y acumular los resultados parciales
+            aggregated_table = None
+            for chunk in self.iter_filtered_chunks(equality_filters, []):
+                chunk_table = (chunk.groupby(by, sort=False, observed=True)["total_value"]
+                               .agg(frecuency="size", total_value="sum"))
+                if aggregated_table is not None:
+                    chunk_table = (pd.concat([aggregated_table, chunk_table])
+                                   .groupby(level=by, sort=False, observed=True).sum())
+                aggregated_table = chunk_table
+            return aggregated_table.reset_index()
+        # Tabla filtrada
+        filtered_table = self._apply_filters(equality_filters, [])
+        # Conteo y suma por grupo en una sola agrupación vectorizada
+        aggregated_table = (filtered_table.groupby(by, sort=False, observed=True)["total_value"]
+                            .agg(frecuency="size", total_value="sum")
+                            .reset_index())
+        return aggregated_table
+
+    @instrumented(rows=None)
+    def _measures(self, equality_filters: Dict[str, object], range_filters: List[Tuple]) -> Tuple[int, int]:
+        # Frecuencia y valor se guardan juntos en la caché, de modo que pedir el valor después
+        # de la frecuencia (o al revés) no vuelve a recorrer el cubo ni las filas
+        return self.query_cache.get(("measures",) + query_key(equality_filters, range_filters),
+                                    lambda: super(Service, self)._measures(equality_filters, range_filters))
+
     def get_total_elements(self, direction:str or None = None, year:int or None = None, transport_mode:str or None = None) -> int:
         """ 
         Cuenta el número de transacciones en una tabla filtrada.
@@ -39,20 +245,17 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: Total de casos en tabla filtrada. 
         """
-        # Tabla filtrada
-        filtered_table = self.filter_routes_df(direction=direction, start_year=year,
-                                               end_year=year, transport_mode=transport_mode)
-        # Contar filas en la tabla
-        elements_count= len(filtered_table)
+        # Contar transacciones del corte con una consulta (se resuelve desde el cubo)
+        elements_count = self.query().direction(direction).year(year).transport_mode(transport_mode).agg(value=False)["frecuency"]
         return elements_count
 
-    def get_route_frecuency(self, route:str, direction:str or None = None, year:int or None = None)-> int:
+    def get_route_frecuency(self, route:str or Tuple[str, str], direction:str or None = None, year:int or None = None)-> int:
         """
         Cuenta las veces que una ruta aparece en una tabla filtrada.
         Se pueden filtrar resultados por dirección, año y/o medio de transporte.
 
         Args:
-            route (str): Rutas con formato origen-destino.
+            route (str or Tuple[str, str]): Ruta con formato origen-destino o tupla (origen, destino).
             direction (str or None, optional): Dirección de transacción. Defaults to None.
             year (int or None, optional): Año de transacciones. Defaults to None.
 
@@ -60,12 +263,9 @@ class Service(SynergyLogisticsFilters):
             int: Numero de apariciones de ruta en la tabla filtrada.
         """
         # Obtener origen y destino para filtros
-        origin, destination = route.split("-")
-        # Tabla filtrada
-        filtered_table = self.filter_routes_df(origin=origin, destination=destination, direction=direction,
-                                               start_year=year, end_year=year)
-        # Contar filas en la tabla
-        route_frecuency = len(filtered_table)
+        origin, destination = self.split_route(route)
+        # Contar transacciones de la ruta con una consulta (se resuelve desde el cubo)
+        route_frecuency = self.query().route(origin, destination).direction(direction).year(year).agg(value=False)["frecuency"]
         return route_frecuency
         
     def get_total_value(self, direction:str or None = None, year:int or None = None, transport_mode: str or None = None) -> int:
@@ -82,17 +282,16 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: suma de valor de elementos en tabla filtrada.
         """
-        filtered_table = self.filter_routes_df(direction=direction, start_year=year, end_year=year, transport_mode=transport_mode)
-        total_value = filtered_table["total_value"].sum()
+        total_value = self.query().direction(direction).year(year).transport_mode(transport_mode).agg(count=False)["total_value"]
         return total_value
 
-    def get_route_value(self, route:str, direction:str or None = None, year:int or None = None) -> int:
+    def get_route_value(self, route:str or Tuple[str, str], direction:str or None = None, year:int or None = None) -> int:
         """
         Suma el valor total para una ruta especifica dentro de una tabla filtrada.
         Se pueden filtrar resultados por dirección, año y/o medio de transporte.
 
         Args:
-            route (str): Rutas con formato origen-destino.
+            route (str or Tuple[str, str]): Ruta con formato origen-destino o tupla (origen, destino).
             direction (str or None, optional): Dirección de transacción. Defaults to None.
             year (int or None, optional): Año de transacciones. Defaults to None.
             transport_mode (str or None, optional): Tipo de medio de transporte. Defaults to None.
@@ -100,10 +299,8 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: suma de valor de elementos en tabla filtrada.
         """
-        origin, destination = route.split("-")
-        filtered_table = self.filter_routes_df(origin=origin, destination=destination, direction=direction,
-                                               start_year=year, end_year=year)
-        route_value = filtered_table["total_value"].sum()
+        origin, destination = self.split_route(route)
+        route_value = self.query().route(origin, destination).direction(direction).year(year).agg(count=False)["total_value"]
         return route_value
 
     def get_top_ten(self, all_cases: dict) -> dict:
@@ -115,12 +312,36 @@ class Service(SynergyLogisticsFilters):
         Returns:
             List: Lista con los 10 casos con mejores resultados.  
         """
-        top_ten_cases = sorted(all_cases, key=all_cases.get, reverse=True)[:10]
-        top_ten_dict = {}
-        for case in top_ten_cases:
-            top_ten_dict[case] = all_cases[case]
+        return self.top_k(all_cases, 10)
+
+    @instrumented(rows=lambda result, self, data, *args, **kwargs: len(data))
+    def top_k(self, data: dict or DataFrame, k: int = 10, key: Callable or str or List[str] or None = None,
+              ascending: bool = False, keep_ties: bool = False) -> dict or DataFrame:
+        """
+        Obtiene los k casos con mejores resultados sin ordenar todos los datos: con un heap
+        acotado para diccionarios y con argpartition para tablas. Los empates conservan
+        el orden original.
 
-        return top_ten_dict
+        Args:
+            data (dict or DataFrame): Diccionario caso -> valor, o tabla con columnas de medidas.
+            k (int, optional): Número de casos a conservar. Defaults to 10.
+            key (Callable or str or List[str] or None, optional): Para diccionarios, función que
+                se aplica a cada valor. Para tablas, columna (o lista de columnas) por la que se
+                ordena. Defaults to None.
+            ascending (bool, optional): Si es True, se toman los valores menores. Defaults to False.
+            keep_ties (bool, optional): Si es True, se incluyen los casos empatados con el k-esimo.
+                Defaults to False.
+
+        Returns:
+            dict or DataFrame: Diccionario con los k mejores casos, ordenado. Para tablas, las
+                filas seleccionadas; si key es una lista, un diccionario medida -> tabla.
+        """
+        if isinstance(data, DataFrame):
+            if isinstance(key, list):
+                return {measure: self.top_k(data, k, measure, ascending, keep_ties) for measure in key}
+            positions = top_positions(data[key].to_numpy(), k, ascending, keep_ties)
+            return data.iloc[positions]
+        return dict(top_items(data.items(), k, key, ascending, keep_ties))
 
     def get_transport_frecuency(self, transport:str, direction:str or None = None, year:int or None = None)-> int:
         """
@@ -135,11 +356,8 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: Numero de apariciones de transporte en la tabla filtrada.
         """
-        # Tabla filtrada
-        filtered_table = self.filter_routes_df(transport_mode=transport, direction=direction,
-                                               start_year=year, end_year=year)
-        # Contar filas en la tabla
-        transport_frecuency = len(filtered_table)
+        # Contar transacciones del transporte con una consulta (se resuelve desde el cubo)
+        transport_frecuency = self.query().transport_mode(transport).direction(direction).year(year).agg(value=False)["frecuency"]
         return transport_frecuency
         
 
@@ -156,9 +374,7 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: suma de valor de elementos en tabla filtrada.
         """
-        filtered_table = self.filter_routes_df(transport_mode=transport, direction=direction,
-                                               start_year=year, end_year=year)
-        transport_value = filtered_table["total_value"].sum()
+        transport_value = self.query().transport_mode(transport).direction(direction).year(year).agg(count=False)["total_value"]
         return transport_value
 
 
@@ -176,12 +392,9 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: Numero de apariciones de transporte en la tabla filtrada.
         """
-        # Tabla filtrada
-        filtered_table = self.filter_routes_df(origin=origin, destination=destination, direction=direction,
-                                               start_year=year, end_year=year)
-        # Contar filas en la tabla
-        transport_frecuency = len(filtered_table)
-        return transport_frecuency
+        # Contar transacciones del pais con una consulta (se resuelve desde el cubo)
+        country_frecuency = self.query().route(origin, destination).direction(direction).year(year).agg(value=False)["frecuency"]
+        return country_frecuency
         
 
     def get_country_value(self, origin:str or None = None, destination:str or None = None, direction:str or None = None, year:int or None = None) -> int:
@@ -198,10 +411,8 @@ class Service(SynergyLogisticsFilters):
         Returns:
             int: suma de valor de elementos en tabla filtrada.
         """
-        filtered_table = self.filter_routes_df(origin=origin, destination=destination, direction=direction,
-                                               start_year=year, end_year=year)
-        transport_value = filtered_table["total_value"].sum()
-        return transport_value
+        country_value = self.query().route(origin, destination).direction(direction).year(year).agg(count=False)["total_value"]
+        return country_value
 
     def reorder_dict_max(self, data_dict: dict) -> dict:
         """
@@ -214,14 +425,6 @@ class Service(SynergyLogisticsFilters):
         Returns:
             dict: Diccionario de datos filtrados.
         """
-        # Crear nuevo diccionario para almacenar datos ordenados
-        ordered_data_dict = {}
-        ordered_keys = sorted(data_dict, key=data_dict.get, reverse=True)
-        for key in ordered_keys:
-            # if value is 0, skip
-            if data_dict[key] == 0:
-                continue
-            # if value > 0
-            else:
-                ordered_data_dict[key]=data_dict[key]
-        return ordered_data_dict
+        # Omitir valores en 0 y ordenar el resto de mayor a menor
+        non_zero_items = (item for item in data_dict.items() if item[1] != 0)
+        return dict(top_items(non_zero_items, len(data_dict)))
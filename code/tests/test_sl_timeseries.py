@@ -0,0 +1,102 @@
+"""
+Pruebas de las series de tiempo con sumas acumuladas (processing.sl_timeseries).
+
+Uso (desde la carpeta code):
+    python -m pytest -q tests
+"""
+import pandas as pd
+import pytest
+
+from processing.sl_timeseries import SynergyLogisticsTimeSeries
+
+
+def routes_table() -> pd.DataFrame:
+    """Tabla pequeña con registros en 2016, 2017 y 2019 (2018 sin registros)."""
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2016-02-01", "2016-08-01", "2017-05-01", "2019-03-01", "2019-11-01"]),
+        "direction": ["Exports", "Imports", "Exports", "Exports", "Imports"],
+        "origin": ["Japan", "China", "Japan", "Mexico", "China"],
+        "destination": ["China", "Japan", "Mexico", "Japan", "Mexico"],
+        "transport_mode": ["Sea", "Air", "Sea", "Rail", "Sea"],
+        "product": ["Cars", "Toys", "Cars", "Food", "Toys"],
+        "total_value": [100, 200, 300, 400, 500],
+    })
+
+
+def measures(table: pd.DataFrame) -> tuple:
+    """Frecuencia y valor de la única fila de un resultado de range_total."""
+    return int(table["frecuency"].iloc[0]), int(table["total_value"].iloc[0])
+
+
+def test_range_total_inside_series():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    assert measures(time_series.range_total()) == (5, 1500)
+    assert measures(time_series.range_total(2016, 2017)) == (3, 600)
+    assert measures(time_series.range_total(2018, 2018)) == (0, 0)
+
+
+def test_range_total_clamps_to_series():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    # Rangos que empiezan antes o terminan después de las series solo cuentan sus periodos
+    assert measures(time_series.range_total(start=2010)) == (5, 1500)
+    assert measures(time_series.range_total(start=2010, end=2016)) == (2, 300)
+    assert measures(time_series.range_total(start=2019, end=2030)) == (2, 900)
+
+
+def test_range_total_empty_ranges():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    assert measures(time_series.range_total(start=2030)) == (0, 0)
+    assert measures(time_series.range_total(end=2010)) == (0, 0)
+    assert measures(time_series.range_total(start=2019, end=2016)) == (0, 0)
+
+
+def test_range_total_by_dimension_out_of_range():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    table = time_series.range_total(start=2030, by="direction")
+    assert table["direction"].tolist() == ["Exports", "Imports"]
+    assert table["total_value"].tolist() == [0, 0]
+
+
+def test_range_total_quarters():
+    time_series = SynergyLogisticsTimeSeries(routes_table(), freq="quarter")
+    assert measures(time_series.range_total("2015Q1", "2016Q1")) == (1, 100)
+    assert measures(time_series.range_total("2019Q4")) == (1, 500)
+    assert measures(time_series.range_total("2020Q1")) == (0, 0)
+
+
+def test_rolling_rejects_non_positive_window():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    for window in [0, -1]:
+        with pytest.raises(ValueError):
+            time_series.rolling(window)
+
+
+def test_growth_rejects_non_positive_periods():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    for periods in [0, -1]:
+        with pytest.raises(ValueError):
+            time_series.growth(periods=periods)
+
+
+def test_growth_against_previous_year():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    growth = time_series.growth()
+    # 2017 contra 2016 (300 vs 300), 2018 sin registros y 2019 contra 2018 (sin base de comparación)
+    assert growth["period"].astype(str).tolist() == ["2017", "2018", "2019"]
+    assert growth["total_value_growth"].tolist()[:2] == [0.0, -100.0]
+    assert growth["total_value_growth"].isna().tolist() == [False, False, True]
+    assert growth.equals(time_series.growth(periods=1))
+
+
+def test_rolling_window_longer_than_series():
+    time_series = SynergyLogisticsTimeSeries(routes_table())
+    assert time_series.rolling(2)["total_value"].tolist() == [600, 300, 900]
+    assert len(time_series.rolling(10)) == 0
+
+
+def test_empty_series():
+    time_series = SynergyLogisticsTimeSeries(None)
+    assert len(time_series.buckets) == 0
+    assert len(time_series.series()) == 0
+    assert len(time_series.rolling(1)) == 0
+    assert measures(time_series.range_total(start=2016)) == (0, 0)
@@ -0,0 +1,66 @@
+"""
+Pruebas del pool de particiones (services.synergy_runner).
+
+Uso (desde la carpeta code):
+    python -m pytest -q tests
+"""
+import pytest
+
+from services.synergy_runner import PartitionRunner
+from services.synergy_services import Service
+from utils import instrumentation
+
+# Registros con el mismo formato que la base de Synergy Logistics
+CSV_ROWS = [
+    "register_id,direction,origin,destination,year,date,product,transport_mode,company_name,total_value",
+    "1,Exports,Japan,China,2015,31/01/15,Cars,Sea,Honda,33000000",
+    "2,Exports,Japan,China,2016,01/02/16,Cars,Sea,Honda,16000000",
+    "3,Imports,China,Mexico,2017,15/06/17,Toys,Air,Lego,2000000",
+    "4,Imports,Mexico,Japan,2018,20/09/18,Food,Rail,Bimbo,500000",
+]
+
+
+def unique_values_partition(service: Service, column: str) -> list:
+    """Partición de prueba: valores distintos de una columna."""
+    return service.get_unique_values(column)
+
+
+@pytest.fixture
+def data_file_path(tmp_path) -> str:
+    data_file = tmp_path / "synergy_logistics_database.csv"
+    data_file.write_text("\n".join(CSV_ROWS) + "\n")
+    return str(data_file)
+
+
+@pytest.fixture
+def profiling():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def profiled_calls(data_file_path: str, workers: int) -> dict:
+    """Llamadas por etapa de una carga y cuatro particiones con el número de procesos indicado."""
+    instrumentation.reset()
+    service_options = {"compact": True, "data_file_path": data_file_path}
+    service = Service(**service_options)
+    with PartitionRunner(service, workers, service_options) as runner:
+        task_ids = [runner.submit(unique_values_partition, column)
+                    for column in ["direction", "origin", "destination", "product"]]
+        for task_id in task_ids:
+            runner.result(task_id)
+    summary = instrumentation.summary()
+    return dict(zip(summary["stage"], summary["calls"]))
+
+
+def test_profile_counts_do_not_depend_on_workers(data_file_path, profiling):
+    single_process = profiled_calls(data_file_path, 1)
+    assert single_process["SynergyLogisticsFilters.get_unique_values"] == 4
+    for workers in [2, 3]:
+        calls = profiled_calls(data_file_path, workers)
+        # Cada proceso del pool carga su propia tabla (a lo más una vez); el resto coincide
+        assert calls.pop("SynergyLogisticsFilters.load") <= 1 + workers
+        assert calls == {stage: count for stage, count in single_process.items()
+                         if stage != "SynergyLogisticsFilters.load"}
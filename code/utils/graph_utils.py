@@ -1,24 +1,144 @@
 import os 
+from concurrent.futures import ProcessPoolExecutor, wait
+from types import ModuleType
+from typing import TYPE_CHECKING, List, Tuple
 
-import plotly.graph_objects as go
-from plotly.missing_ipywidgets import FigureWidget
+from utils.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    import plotly.graph_objects
+    from plotly.missing_ipywidgets import FigureWidget
+
+# Tamaño de las imagenes exportadas
+IMAGE_WIDTH = 1350
+IMAGE_HEIGHT = 730
+# plotly.graph_objects, importado la primera vez que se genera una gráfica
+_graph_objects = None
+
+
+def plotly_graph_objects() -> ModuleType:
+    """
+    Importa plotly la primera vez que se necesita. Las ejecuciones que solo generan tablas no
+    cargan plotly ni modifican PATH.
+
+    Returns:
+        ModuleType: Módulo plotly.graph_objects.
+    """
+    global _graph_objects
+    if _graph_objects is None:
+        import plotly.graph_objects as go
+        # Comando necesario para usar librerias de imagenes fijas
+        os.environ["PATH"] = os.environ["PATH"] + f";{os.path.abspath('venv/lib/site-packages/kaleido/executable/')}"
+        _graph_objects = go
+    return _graph_objects
+
+
+def render_image(fig_json: str, file_name: str) -> None:
+    """Exporta como imagen una gráfica serializada en JSON (se ejecuta en los procesos del pool).
+
+    Args:
+        fig_json (str): Gráfica serializada con fig.to_json().
+        file_name (str): Ruta donde almacenar el archivo.
+    """
+    import plotly.io as pio
+    plotly_graph_objects()
+    pio.from_json(fig_json).write_image(file_name, width=IMAGE_WIDTH, height=IMAGE_HEIGHT)
+
+
+class ChartRenderPool:
+    """
+    Cola de gráficas para exportar imagenes en paralelo. Cada proceso del pool mantiene su
+    propia sesión de kaleido, que se reutiliza para todas las gráficas que le tocan.
+    """
+    def __init__(self, workers: int or None = None) -> None:
+        """Crea el pool de procesos.
+
+        Args:
+            workers (int or None, optional): Número de procesos. Defaults to None (uno por CPU).
+        """
+        self.workers = workers or os.cpu_count()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._pending = []
+
+    def submit(self, fig: "FigureWidget", file_name: str) -> None:
+        """Agrega una gráfica a la cola de exportación.
+
+        Args:
+            fig (plotly.graph_objects.Figure): Objeto de la gráfica creada.
+            file_name (str): Ruta donde almacenar el archivo.
+        """
+        self.submit_json(fig.to_json(), file_name)
+
+    def submit_json(self, fig_json: str, file_name: str) -> None:
+        """Agrega a la cola una gráfica ya serializada (p. ej. la que envía un proceso de particiones).
+
+        Args:
+            fig_json (str): Gráfica serializada con fig.to_json().
+            file_name (str): Ruta donde almacenar el archivo.
+        """
+        self._pending.append(self._executor.submit(render_image, fig_json, file_name))
+
+    def flush(self) -> int:
+        """Espera a que se exporten todas las gráficas en cola.
+
+        Returns:
+            int: Número de gráficas exportadas.
+        """
+        pending, self._pending = self._pending, []
+        wait(pending)
+        # Propagar el primer error de exportación, si lo hubo
+        for future in pending:
+            future.result()
+        return len(pending)
+
+    def close(self) -> None:
+        """Exporta las gráficas pendientes y termina los procesos del pool."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "ChartRenderPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ChartBuffer:
+    """
+    Acumula las gráficas que exporta una partición en un proceso del pool de particiones. Las
+    gráficas se regresan serializadas al proceso principal, que las envía a su ChartRenderPool.
+    """
+    def __init__(self) -> None:
+        self.images: List[Tuple[str, str]] = []
+
+    def submit(self, fig: "FigureWidget", file_name: str) -> None:
+        """Guarda una gráfica serializada y la ruta de su imagen (ver ChartRenderPool.submit)."""
+        self.images.append((fig.to_json(), file_name))
 
-# Comando necesario para usar librerias de imagenes fijas
-os.environ["PATH"] = os.environ["PATH"] + f";{os.path.abspath('venv/lib/site-packages/kaleido/executable/')}"
 
 class Chart:
     """
     Funciones generales para la generación de gráficas.
     """
-    def save_as_image(self, fig:FigureWidget, file_name: str):
+    # Pool para exportar imagenes en paralelo (None = exportación inmediata)
+    renderer = None
+
+    @instrumented(rows=None)
+    def save_as_image(self, fig: "FigureWidget", file_name: str):
         """ Esta función guarda una gráfica como imagen.
         Args:
             fig (plotly.graph_objects.Figure): Objeto de la gráfica creada.
             file_name (str): Ruta donde almacenar el archivo.
         """ 
-        fig.write_image(file_name, width=1350, height=730)
+        if self.renderer is not None:
+            self.renderer.submit(fig, file_name)
+        else:
+            fig.write_image(file_name, width=IMAGE_WIDTH, height=IMAGE_HEIGHT)
     
-    def save_plot(self, fig:FigureWidget, file_name:str):
+    @instrumented(rows=None)
+    def save_plot(self, fig: "FigureWidget", file_name:str):
         # Validar si folder existe, o si es necesario crearlo
         if not os.path.exists(f"{self.file_path}"):
             os.makedirs(f"{self.file_path}")
@@ -33,17 +153,29 @@ class Summary_Chart(Chart):
     """
     Funciones para gráfica resultados de las consultas realizadas de las tablas de Lifestore.
     """
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, renderer: ChartRenderPool or ChartBuffer or None = None) -> None:
         """Establece parametros default para objetos de la clase.
 
         Args:
             file_path (str): Ruta donde guardar gráficas.
+            renderer (ChartRenderPool or ChartBuffer or None, optional): Cola para exportar las
+                imagenes en paralelo. Defaults to None (exportación inmediata).
         """
         super().__init__()
         # Definir folder donde se ubicaran las gráficas
         self.file_path = file_path
+        self.renderer = renderer
+        # El formato se crea con la primera gráfica (requiere plotly)
+        self._layout = None
+
+    @property
+    def layout(self) -> "plotly.graph_objects.Layout":
+        """Formato de las gráficas de barras (se crea la primera vez que se usa)."""
+        if self._layout is not None:
+            return self._layout
+        go = plotly_graph_objects()
         # Agregar atributos de formato de gráfica (visualización)
-        self.layout = go.Layout(
+        self._layout = go.Layout(
             title=dict(y=0.99, x=0.5, xanchor='center', yanchor='top'),
             xaxis=dict(showgrid=True, showline=True, linewidth=1,
                        linecolor='black', mirror=True, gridwidth=0.4,
@@ -55,7 +187,9 @@ class Summary_Chart(Chart):
             margin=dict(r=20, t=35),
             plot_bgcolor='rgba(0,0,0,0)', width=1080, height=566,
             font=dict(family='Arial, monospace', size=18))
+        return self._layout
 
+    @instrumented(rows=None)
     def bar_summary(self, data: dict, plot_title: str, x_axis_name: str, y_axis_name: str,
                     file_name: str, color:str = "blue") -> None:
         """Gráfica de barras a partir de un diccionario.
@@ -68,6 +202,7 @@ class Summary_Chart(Chart):
             file_name (str): Nombre del archivo.
             color (str, optional): Color del gráfico. Defaults to "blue".
         """          
+        go = plotly_graph_objects()
         # Se da de alta diccionario con colores disponibles
         color_dict = {"blue": "rgb(15, 78, 171)", "green": "rgb(15, 171, 72)",
                       "red": "rgb(232, 4, 0)", "purple": "rgb(109, 15, 171)",
@@ -96,6 +231,7 @@ class Summary_Chart(Chart):
         # Salvar resultados
         self.save_plot(fig, file_name)
 
+    @instrumented(rows=None)
     def h_bar_summary(self, data: dict, plot_title: str, x_axis_name: str, y_axis_name: str,
                       file_name: str, color:str = "blue") -> None:
         """Gráfica de barras a partir de un diccionario.
@@ -108,6 +244,7 @@ class Summary_Chart(Chart):
             file_name (str): Nombre del archivo.
             color (str, optional): Color del gráfico. Defaults to "blue".
         """          
+        go = plotly_graph_objects()
         # Se da de alta diccionario con colores disponibles
         color_dict = {"blue": "rgb(15, 78, 171)", "green": "rgb(15, 171, 72)",
                       "red": "rgb(232, 4, 0)", "purple": "rgb(109, 15, 171)",
@@ -139,7 +276,9 @@ class Summary_Chart(Chart):
         # Salvar resultados
         self.save_plot(fig, file_name)
 
+    @instrumented(rows=None)
     def pie_summary(self, data: dict, plot_title: str, file_name: str):
+        go = plotly_graph_objects()
         # Separar diccionarios en dos listas, una para cada eje
         x_data = list(data.keys())
         y_data = list(data.values())
@@ -0,0 +1,177 @@
+"""
+Instrumentación opcional de las etapas del análisis (carga, filtros, agregaciones, escritura de
+CSV y exportación de gráficas). Registra número de llamadas, tiempo acumulado, latencia p50/p95,
+filas recorridas (las de la tabla de entrada) y filas regresadas. Está desactivada por defecto: en ese caso cada llamada instrumentada solo
+revisa una bandera.
+"""
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+# Bandera global; se consulta en cada llamada instrumentada
+_enabled = False
+# Etapa -> {"times": [segundos por llamada], "rows": filas recorridas, "rows_out": filas regresadas}
+_stats: Dict[str, Dict[str, object]] = {}
+
+
+def enable() -> None:
+    """Activa el registro de tiempos."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Desactiva el registro de tiempos (lo registrado se conserva)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Indica si el registro de tiempos está activo."""
+    return _enabled
+
+
+def reset() -> None:
+    """Descarta lo registrado."""
+    _stats.clear()
+
+
+def record(name: str, seconds: float, rows: int = 0, rows_out: int = 0) -> None:
+    """Registra una llamada de una etapa.
+
+    Args:
+        name (str): Nombre de la etapa.
+        seconds (float): Duración de la llamada.
+        rows (int, optional): Filas recorridas en la llamada. Defaults to 0.
+        rows_out (int, optional): Filas regresadas por la llamada. Defaults to 0.
+    """
+    stage_stats = _stats.setdefault(name, {"times": [], "rows": 0, "rows_out": 0})
+    stage_stats["times"].append(seconds)
+    stage_stats["rows"] += rows
+    stage_stats["rows_out"] += rows_out
+
+
+def result_rows(result: object, *args, **kwargs) -> int:
+    """Filas de un resultado: largo de una tabla, 0 para otros resultados."""
+    return len(result) if isinstance(result, DataFrame) else 0
+
+
+def instrumented(name: str or None = None, rows: Callable or None = None,
+                 rows_out: Callable or None = result_rows) -> Callable:
+    """
+    Decorador que registra la duración de cada llamada a la función cuando la instrumentación
+    está activa.
+
+    Args:
+        name (str or None, optional): Nombre de la etapa. Defaults to None (nombre calificado
+            de la función).
+        rows (Callable or None, optional): Función (resultado, *args, **kwargs) -> filas
+            recorridas. Defaults to None (no se registran).
+        rows_out (Callable or None, optional): Función (resultado, *args, **kwargs) -> filas
+            regresadas. Defaults to result_rows.
+
+    Returns:
+        Callable: Decorador.
+    """
+    def decorator(function: Callable) -> Callable:
+        stage_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            record(stage_name, elapsed, rows(result, *args, **kwargs) if rows is not None else 0,
+                   rows_out(result, *args, **kwargs) if rows_out is not None else 0)
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Dict[str, int]]:
+    """
+    Registra la duración de un bloque de código. El bloque puede indicar las filas que recorrió
+    asignando counter["rows"].
+
+    Args:
+        name (str): Nombre de la etapa.
+
+    Yields:
+        Iterator[Dict[str, int]]: Contador de filas del bloque.
+    """
+    counter = {"rows": 0}
+    if not _enabled:
+        yield counter
+        return
+    start = time.perf_counter()
+    try:
+        yield counter
+    finally:
+        record(name, time.perf_counter() - start, counter["rows"])
+
+
+def snapshot() -> Dict[str, Dict[str, object]]:
+    """Copia de lo registrado (p. ej. para enviarla desde un proceso del pool).
+
+    Returns:
+        Dict[str, Dict[str, object]]: Etapa -> tiempos y filas.
+    """
+    return {name: {"times": list(stage_stats["times"]), "rows": stage_stats["rows"],
+                   "rows_out": stage_stats["rows_out"]}
+            for name, stage_stats in _stats.items()}
+
+
+def merge(other_stats: Dict[str, Dict[str, object]]) -> None:
+    """Suma lo registrado en otro proceso.
+
+    Args:
+        other_stats (Dict[str, Dict[str, object]]): Resultado de snapshot() en otro proceso.
+    """
+    for name, stage_stats in other_stats.items():
+        own_stats = _stats.setdefault(name, {"times": [], "rows": 0, "rows_out": 0})
+        own_stats["times"].extend(stage_stats["times"])
+        own_stats["rows"] += stage_stats["rows"]
+        own_stats["rows_out"] += stage_stats["rows_out"]
+
+
+def summary() -> DataFrame:
+    """Tabla resumen por etapa, ordenada por tiempo acumulado.
+
+    Returns:
+        DataFrame: Llamadas, tiempo acumulado (s), latencia p50 y p95 (ms), filas recorridas
+            y filas regresadas.
+    """
+    records: List[Dict[str, object]] = []
+    for name, stage_stats in _stats.items():
+        times = np.array(stage_stats["times"])
+        records.append({"stage": name, "calls": len(times), "total_s": round(times.sum(), 4),
+                        "p50_ms": round(np.percentile(times, 50) * 1000, 3),
+                        "p95_ms": round(np.percentile(times, 95) * 1000, 3),
+                        "rows": stage_stats["rows"], "rows_out": stage_stats["rows_out"]})
+    columns = ["stage", "calls", "total_s", "p50_ms", "p95_ms", "rows", "rows_out"]
+    return pd.DataFrame(records, columns=columns).sort_values("total_s", ascending=False, ignore_index=True)
+
+
+def print_report() -> None:
+    """Imprime la tabla resumen en consola."""
+    print("\nTiempos por etapa:")
+    print(summary().to_string(index=False))
+
+
+def dump_json(file_path: str) -> None:
+    """Guarda la tabla resumen como JSON.
+
+    Args:
+        file_path (str): Ruta del archivo.
+    """
+    with open(file_path, "w") as json_file:
+        json.dump(summary().to_dict(orient="records"), json_file, indent=2)
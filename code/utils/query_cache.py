@@ -0,0 +1,87 @@
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+from pandas.core.frame import DataFrame
+
+
+def result_nbytes(result: object) -> int:
+    """Memoria aproximada de un resultado (tablas: memoria de sus columnas e indice).
+
+    Args:
+        result (object): Resultado de una consulta.
+
+    Returns:
+        int: Bytes.
+    """
+    if isinstance(result, DataFrame):
+        return int(result.memory_usage(index=True).sum())
+    return sys.getsizeof(result)
+
+
+class QueryCache:
+    """
+    Caché de resultados de consultas acotada por número de resultados y por memoria. Al
+    llenarse se descartan los resultados usados hace más tiempo (LRU). Lleva la cuenta de
+    aciertos y fallos.
+    """
+    def __init__(self, maxsize: int = 128, max_bytes: int or None = None) -> None:
+        """Crea la caché vacía.
+
+        Args:
+            maxsize (int, optional): Número máximo de resultados guardados (0 desactiva la
+                caché). Defaults to 128.
+            max_bytes (int or None, optional): Memoria máxima de los resultados guardados; un
+                resultado más grande no se guarda. Defaults to None (sin limite).
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._results = OrderedDict()
+        self._sizes = {}
+
+    def get(self, key: Hashable, compute: Callable[[], object]) -> object:
+        """Regresa el resultado guardado para la llave, o lo calcula y lo guarda.
+
+        Args:
+            key (Hashable): Llave normalizada de la consulta.
+            compute (Callable[[], object]): Función que calcula el resultado si no está guardado.
+
+        Returns:
+            object: Resultado de la consulta.
+        """
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+        self.misses += 1
+        result = compute()
+        size = result_nbytes(result) if self.max_bytes is not None else 0
+        if self.maxsize > 0 and (self.max_bytes is None or size <= self.max_bytes):
+            self._results[key] = result
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._results) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                oldest_key, _ = self._results.popitem(last=False)
+                self.nbytes -= self._sizes.pop(oldest_key)
+        return result
+
+    def clear(self) -> None:
+        """Descarta los resultados guardados (los contadores se conservan)."""
+        self._results.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def info(self) -> Dict[str, int]:
+        """Estadisticas de uso de la caché.
+
+        Returns:
+            Dict[str, int]: Aciertos, fallos, resultados guardados, tamaño máximo y memoria usada.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._results), "maxsize": self.maxsize,
+                "nbytes": self.nbytes}
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -0,0 +1,74 @@
+import heapq
+from typing import Callable, Iterable, List, Tuple
+import numpy as np
+
+
+def top_items(items: Iterable[Tuple], k: int, key: Callable or None = None,
+              ascending: bool = False, keep_ties: bool = False) -> List[Tuple]:
+    """
+    Selecciona los k pares (llave, valor) con mejor valor usando un heap acotado, en
+    O(n log k). Los empates conservan el orden de entrada, igual que sorted().
+
+    Args:
+        items (Iterable[Tuple]): Pares (llave, valor).
+        k (int): Número de elementos a conservar.
+        key (Callable or None, optional): Función aplicada al valor para ordenar. Defaults to None.
+        ascending (bool, optional): Si es True, se seleccionan los valores menores. Defaults to False.
+        keep_ties (bool, optional): Si es True, se incluyen también los elementos empatados con
+            el k-esimo. Defaults to False.
+
+    Returns:
+        List[Tuple]: Pares seleccionados, ordenados.
+    """
+    if key is None:
+        item_key = lambda item: item[1]
+    else:
+        item_key = lambda item: key(item[1])
+    select = heapq.nsmallest if ascending else heapq.nlargest
+    if not keep_ties:
+        return select(k, items, key=item_key)
+    # Para incluir empates se necesita recorrer los datos una segunda vez
+    items = list(items)
+    selected = select(k, items, key=item_key)
+    if len(selected) < k or k == 0:
+        return selected
+    threshold = item_key(selected[-1])
+    selected_keys = {item[0] for item in selected}
+    ties = [item for item in items if item_key(item) == threshold and item[0] not in selected_keys]
+    return selected + ties
+
+
+def top_positions(values: np.ndarray, k: int, ascending: bool = False,
+                  keep_ties: bool = False) -> np.ndarray:
+    """
+    Posiciones de los k mejores valores de un arreglo numerico usando argpartition, en O(n)
+    más el ordenamiento de los k seleccionados. Los empates conservan el orden de entrada.
+
+    Args:
+        values (np.ndarray): Valores a ordenar.
+        k (int): Número de elementos a conservar.
+        ascending (bool, optional): Si es True, se seleccionan los valores menores. Defaults to False.
+        keep_ties (bool, optional): Si es True, se incluyen también los elementos empatados con
+            el k-esimo. Defaults to False.
+
+    Returns:
+        np.ndarray: Posiciones seleccionadas, ordenadas por valor.
+    """
+    # Se trabaja siempre "de menor a mayor"
+    values = np.asarray(values)
+    order_values = values.astype(np.int64 if np.issubdtype(values.dtype, np.integer) else np.float64)
+    if not ascending:
+        order_values = -order_values
+    n = len(order_values)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        threshold = order_values[np.argpartition(order_values, k - 1)[k - 1]]
+        better = np.flatnonzero(order_values < threshold)
+        ties = np.flatnonzero(order_values == threshold)
+        if not keep_ties:
+            ties = ties[:k - len(better)]
+        candidates = np.sort(np.concatenate([better, ties]))
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(order_values[candidates], kind="stable")]
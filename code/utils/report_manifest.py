@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from typing import Dict
+
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+
+def table_fingerprint(*tables: DataFrame) -> str:
+    """Huella (SHA-256) del contenido de una o varias tablas, incluyendo su indice.
+
+    Returns:
+        str: Huella en hexadecimal.
+    """
+    digest = hashlib.sha256()
+    for table in tables:
+        digest.update(pd.util.hash_pandas_object(table, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ReportManifest:
+    """
+    Registro de la huella de los datos de cada partición del reporte (opción/dirección/año).
+    Si la huella de una partición no cambia entre ejecuciones, sus archivos y gráficas no
+    necesitan volver a generarse.
+    """
+    def __init__(self, file_path: str, force: bool = False) -> None:
+        """Carga el registro existente, si lo hay.
+
+        Args:
+            file_path (str): Ruta del archivo JSON del registro.
+            force (bool, optional): Si es True, se ignora el registro existente y todas las
+                particiones se consideran modificadas. Defaults to False.
+        """
+        self.file_path = file_path
+        self.fingerprints: Dict[str, str] = {}
+        if not force and os.path.exists(file_path):
+            with open(file_path) as manifest_file:
+                self.fingerprints = json.load(manifest_file)
+
+    def previous(self, partition: str) -> str or None:
+        """Huella registrada de una partición.
+
+        Args:
+            partition (str): Llave de la partición (p. ej. 'opcion_1/Exports/2019').
+
+        Returns:
+            str or None: Huella de la ejecución anterior, o None si no existe.
+        """
+        return self.fingerprints.get(partition)
+
+    def update(self, partition: str, fingerprint: str) -> None:
+        """Registra la huella actual de una partición.
+
+        Args:
+            partition (str): Llave de la partición.
+            fingerprint (str): Huella de los datos de la partición.
+        """
+        self.fingerprints[partition] = fingerprint
+
+    def save(self) -> None:
+        """Guarda el registro en disco."""
+        folder = os.path.dirname(self.file_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(self.file_path, "w") as manifest_file:
+            json.dump(self.fingerprints, manifest_file, indent=2, sort_keys=True)
+
+
+def is_dirty(fingerprint: str, previous_fingerprint: str or None, *output_folders: str) -> bool:
+    """Indica si una partición debe regenerarse: sus datos cambiaron o faltan sus carpetas.
+
+    Args:
+        fingerprint (str): Huella actual de los datos.
+        previous_fingerprint (str or None): Huella de la ejecución anterior.
+
+    Returns:
+        bool: True si hay que escribir archivos y gráficas de la partición.
+    """
+    if fingerprint != previous_fingerprint:
+        return True
+    return not all(os.path.exists(folder) for folder in output_folders)
@@ -0,0 +1,228 @@
+import os
+import sqlite3
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+from utils.instrumentation import instrumented
+
+# Columnas llave de cada partición del reporte
+KEY_COLUMNS = ["option", "direction", "year"]
+
+
+@instrumented("csv_write", rows=lambda result, table, file_path: len(table))
+def write_csv(table: DataFrame, file_path: str) -> None:
+    """Guarda una tabla de resultados como CSV (sin indice).
+
+    Args:
+        table (DataFrame): Tabla de resultados.
+        file_path (str): Ruta del archivo.
+    """
+    table.to_csv(file_path, index=False)
+
+
+def sql_type(column: pd.Series) -> str:
+    """Tipo de SQLite para una columna de una tabla."""
+    if pd.api.types.is_integer_dtype(column) or pd.api.types.is_bool_dtype(column):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(column):
+        return "REAL"
+    return "TEXT"
+
+
+def sql_value(value: object) -> object:
+    """Valor de Python que SQLite puede guardar (los escalares de NumPy se convierten)."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class CsvResultWriter:
+    """
+    Escritura de resultados como un CSV por tabla en la carpeta de cada partición
+    (opcion_*/<dirección>/<año>/<tabla>.csv). Modo de compatibilidad con los reportes anteriores.
+    """
+    def __init__(self, output_initial_path: str) -> None:
+        """
+        Args:
+            output_initial_path (str): Carpeta raiz de resultados.
+        """
+        self.output_initial_path = output_initial_path
+
+    def folder(self, option: str, direction: str, year: str or None) -> str:
+        """Carpeta de una partición (sin año para las tablas de toda una dirección)."""
+        folder = f"{self.output_initial_path}/{option}/{direction}"
+        return folder if year is None else f"{folder}/{year}"
+
+    def write(self, option: str, direction: str, year: str or None, name: str, table: DataFrame) -> None:
+        """Guarda una tabla de una partición.
+
+        Args:
+            option (str): Opción del análisis (p. ej. 'opcion_1').
+            direction (str): Dirección ('All', 'Imports' o 'Exports').
+            year (str or None): Año ('All' o 'AAAA'; None para tablas de toda la dirección).
+            name (str): Nombre de la tabla (p. ej. 'results').
+            table (DataFrame): Tabla de resultados.
+        """
+        folder = self.folder(option, direction, year)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        write_csv(table, f"{folder}/{name}.csv")
+
+    def exists(self, option: str, direction: str, year: str or None, name: str) -> bool:
+        """Indica si ya existe una tabla de una partición."""
+        return os.path.exists(f"{self.folder(option, direction, year)}/{name}.csv")
+
+    def close(self) -> None:
+        pass
+
+
+class ResultBuffer:
+    """
+    Acumula en memoria las tablas que escribe una partición. Se usa en los procesos del pool:
+    las tablas se regresan al proceso principal, que las escribe con su propio escritor.
+    """
+    def __init__(self) -> None:
+        self.tables: List[Tuple[str, str, str or None, str, DataFrame]] = []
+
+    def write(self, option: str, direction: str, year: str or None, name: str, table: DataFrame) -> None:
+        """Guarda una tabla de una partición en memoria (ver CsvResultWriter.write)."""
+        self.tables.append((option, direction, year, name, table))
+
+
+class ResultStore:
+    """
+    Resultados de todas las particiones en un solo archivo SQLite. Cada tipo de tabla
+    (results, top10_frec, top10_value, summary) es una tabla de SQLite con las columnas llave
+    option, direction y year, la posición de la fila en la partición y las columnas de la
+    tabla de resultados. Las escrituras se acumulan y se guardan por lotes, cada lote en una
+    sola transacción.
+
+    Ejemplo de consulta:
+        SELECT route, total_value FROM results
+        WHERE option = 'opcion_1' AND direction = 'Exports' AND year = '2019' ORDER BY position
+    """
+    def __init__(self, file_path: str, batch_size: int = 10_000) -> None:
+        """Abre (o crea) el archivo de resultados.
+
+        Args:
+            file_path (str): Ruta del archivo SQLite.
+            batch_size (int, optional): Filas acumuladas a partir de las cuales se escribe un
+                lote. Defaults to 10_000.
+        """
+        self.file_path = file_path
+        self.batch_size = batch_size
+        folder = os.path.dirname(file_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.connection = sqlite3.connect(file_path)
+        self._pending: List[DataFrame] = []
+        self._pending_names: List[str] = []
+        self._pending_rows = 0
+
+    def write(self, option: str, direction: str, year: str or None, name: str, table: DataFrame) -> None:
+        """
+        Agrega una tabla de una partición al lote actual; reemplaza a la tabla que la partición
+        tuviera guardada. Si la tabla trae una columna 'year' (p. ej. el resumen multianual),
+        esa columna se usa como llave en lugar del año de la partición.
+
+        Args:
+            option (str): Opción del análisis (p. ej. 'opcion_1').
+            direction (str): Dirección ('All', 'Imports' o 'Exports').
+            year (str or None): Año ('All' o 'AAAA').
+            name (str): Nombre de la tabla (p. ej. 'results').
+            table (DataFrame): Tabla de resultados.
+        """
+        rows = table.reset_index(drop=True)
+        rows.insert(0, "position", np.arange(len(rows)))
+        for position, (column, value) in enumerate([("option", option), ("direction", direction), ("year", year)]):
+            if column not in rows:
+                rows.insert(position, column, value)
+        self._pending.append(rows)
+        self._pending_names.append(name)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.batch_size:
+            self.flush()
+
+    def _columns(self, name: str) -> List[str]:
+        """Columnas de una tabla de SQLite (vacio si no existe)."""
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info("{name}")')]
+
+    def _ensure_table(self, name: str, rows: DataFrame) -> None:
+        """Crea la tabla de SQLite y su indice de particiones, o agrega las columnas que le falten."""
+        columns = self._columns(name)
+        if not columns:
+            definitions = ", ".join(f'"{column}" {sql_type(rows[column])}' for column in rows.columns)
+            self.connection.execute(f'CREATE TABLE "{name}" ({definitions})')
+            self.connection.execute(f'CREATE INDEX "{name}_partition" ON "{name}" (option, direction, year)')
+            return
+        for column in rows.columns:
+            if column not in columns:
+                self.connection.execute(f'ALTER TABLE "{name}" ADD COLUMN "{column}" {sql_type(rows[column])}')
+
+    @instrumented("result_store_write", rows=lambda result, self: result)
+    def flush(self) -> int:
+        """Escribe el lote actual en una sola transacción.
+
+        Returns:
+            int: Filas escritas.
+        """
+        written_rows = self._pending_rows
+        if not self._pending:
+            return 0
+        with self.connection:
+            for name, rows in zip(self._pending_names, self._pending):
+                self._ensure_table(name, rows)
+                partitions = rows[KEY_COLUMNS].drop_duplicates().itertuples(index=False)
+                self.connection.executemany(
+                    f'DELETE FROM "{name}" WHERE option = ? AND direction = ? AND year IS ?',
+                    [tuple(map(sql_value, partition)) for partition in partitions])
+                columns = ", ".join(f'"{column}"' for column in rows.columns)
+                placeholders = ", ".join("?" for _ in rows.columns)
+                self.connection.executemany(
+                    f'INSERT INTO "{name}" ({columns}) VALUES ({placeholders})',
+                    [tuple(map(sql_value, row)) for row in rows.itertuples(index=False)])
+        self._pending, self._pending_names, self._pending_rows = [], [], 0
+        return written_rows
+
+    def exists(self, option: str, direction: str, year: str or None, name: str) -> bool:
+        """Indica si ya existe una tabla de una partición (sin año: cualquier año de la dirección)."""
+        self.flush()
+        if not self._columns(name):
+            return False
+        query = f'SELECT 1 FROM "{name}" WHERE option = ? AND direction = ?'
+        params = [option, direction]
+        if year is not None:
+            query += " AND year = ?"
+            params.append(year)
+        return self.connection.execute(query + " LIMIT 1", params).fetchone() is not None
+
+    def read(self, name: str, option: str or None = None, direction: str or None = None,
+             year: str or None = None) -> DataFrame:
+        """Lee una tabla de resultados, opcionalmente de una sola opción, dirección y/o año.
+
+        Args:
+            name (str): Nombre de la tabla (p. ej. 'results').
+            option (str or None, optional): Opción. Defaults to None (todas).
+            direction (str or None, optional): Dirección. Defaults to None (todas).
+            year (str or None, optional): Año. Defaults to None (todos).
+
+        Returns:
+            DataFrame: Filas de las particiones pedidas, en su orden original.
+        """
+        self.flush()
+        conditions, params = [], []
+        for column, value in [("option", option), ("direction", direction), ("year", year)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(str(value))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f'SELECT * FROM "{name}"{where} ORDER BY rowid'
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def close(self) -> None:
+        """Escribe el lote pendiente y cierra el archivo."""
+        self.flush()
+        self.connection.close()